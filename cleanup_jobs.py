@@ -2,11 +2,6 @@
 from google_integration import GoogleSheetsIntegration
 from config import Config
 import sys
-from pathlib import Path
-
-# Add current directory to path
-sys.path.append(str(Path(__file__).parent))
-
 
 print("🧹 Cleaning up old individual group jobs...")
 
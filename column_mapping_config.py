@@ -5,12 +5,37 @@ Provides robust column mapping using A,B,C notation instead of relying on header
 """
 
 import logging
+import re
+import string
+from functools import lru_cache
 from typing import Dict, Optional, List, Any
 from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Column letters A..ZZ in sheet order, and their 0-based indexes
+COLUMN_LETTERS = tuple(string.ascii_uppercase) + tuple(
+    a + b for a in string.ascii_uppercase for b in string.ascii_uppercase)
+LETTER_TO_IDX = {letter: i for i, letter in enumerate(COLUMN_LETTERS)}
+
+# Config attribute -> default column letter for the assets worksheet, in
+# _create_mappings_with_positions argument order
+ASSETS_COLUMN_DEFAULTS = (
+    ('ASSETS_DRIVER_NAME_COL', 'D'),
+    ('ASSETS_VIN_COL', 'E'),
+    ('ASSETS_LOCATION_COL', 'F'),
+    ('ASSETS_LATITUDE_COL', 'G'),
+    ('ASSETS_LONGITUDE_COL', 'H'),
+    ('ASSETS_PHONE_COL', 'L'),
+)
+
+
+@lru_cache(maxsize=None)
+def _validation_pattern(regex: str) -> re.Pattern:
+    """Compiled form of a ColumnMapping.validation_regex (few distinct ones)"""
+    return re.compile(regex)
+
 
 class WorksheetType(Enum):
     """Supported worksheet types"""
@@ -49,21 +74,10 @@ class ColumnMappingManager:
         """Initialize column mappings from config or use defaults"""
 
         # Get column positions from config or use defaults
-        if self.config:
-            driver_col = getattr(self.config, 'ASSETS_DRIVER_NAME_COL', 'D')
-            vin_col = getattr(self.config, 'ASSETS_VIN_COL', 'E')
-            location_col = getattr(self.config, 'ASSETS_LOCATION_COL', 'F')
-            latitude_col = getattr(self.config, 'ASSETS_LATITUDE_COL', 'G')
-            longitude_col = getattr(self.config, 'ASSETS_LONGITUDE_COL', 'H')
-            phone_col = getattr(self.config, 'ASSETS_PHONE_COL', 'L')
-        else:
-            # Default positions
-            driver_col = 'D'
-            vin_col = 'E'
-            location_col = 'F'
-            latitude_col = 'G'
-            longitude_col = 'H'
-            phone_col = 'L'
+        config = self.config
+        driver_col, vin_col, location_col, latitude_col, longitude_col, phone_col = (
+            getattr(config, name, default) if config else default
+            for name, default in ASSETS_COLUMN_DEFAULTS)
 
         return self._create_mappings_with_positions(
             driver_col, vin_col, location_col, latitude_col, longitude_col, phone_col)
@@ -195,6 +209,11 @@ class ColumnMappingManager:
     def letter_to_index(self, column_letter: str) -> int:
         """Convert column letter to 0-based index (A=0, B=1, etc.)"""
         column_letter = column_letter.upper()
+        index = LETTER_TO_IDX.get(column_letter)
+        if index is not None:
+            return index
+
+        # Beyond ZZ
         result = 0
         for char in column_letter:
             result = result * 26 + (ord(char) - ord('A') + 1)
@@ -202,6 +221,9 @@ class ColumnMappingManager:
 
     def index_to_letter(self, column_index: int) -> str:
         """Convert 0-based index to column letter (0=A, 1=B, etc.)"""
+        if 0 <= column_index < len(COLUMN_LETTERS):
+            return COLUMN_LETTERS[column_index]
+
         result = ""
         while column_index >= 0:
             result = chr(column_index % 26 + ord('A')) + result
@@ -221,8 +243,7 @@ class ColumnMappingManager:
 
         # Check regex validation
         if mapping.validation_regex and value:
-            import re
-            if not re.match(mapping.validation_regex, str(value)):
+            if not _validation_pattern(mapping.validation_regex).match(str(value)):
                 return False, f"Field {mapping.display_name} does not match required format"
 
         # Type validation
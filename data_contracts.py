@@ -6,9 +6,22 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Iterable
 from zoneinfo import ZoneInfo
+import re
 
 
-@dataclass(frozen=True)
+_UTC = ZoneInfo('UTC')
+_NY_TZ = ZoneInfo('America/New_York')
+
+# Speed inside a status string, e.g. "Moving (42 mph)" or "55mph"
+_SPEED_RE = re.compile(r'(\d+)\s*mph', re.IGNORECASE)
+# Whole statuses (lowercased) that mean the vehicle is not moving
+_ZERO_SPEED_STATUSES = frozenset({'idle', 'stopped', 'parked', 'unknown status'})
+
+# Location sources accepted from the TMS feed
+VALID_SOURCES = frozenset(("samsara", "clubeld", "ada_eld", "skybitz", "intangles"))
+
+
+@dataclass(frozen=True, slots=True)
 class FleetPoint:
     """Core data contract for fleet location points with tz-aware UTC timestamps"""
     vin: str
@@ -19,6 +32,7 @@ class FleetPoint:
     status: Optional[str]               # "Idle" | "Moving" | ...
     updated_at_utc: Optional[datetime]  # tz-aware UTC
     source: str                         # "samsara" | "TMS Auto-Update" | ...
+    idle_since_utc: Optional[datetime] = None  # tz-aware UTC, when known
 
     def __post_init__(self):
         # Ensure VIN is normalized
@@ -31,29 +45,26 @@ class FleetPoint:
             object.__setattr__(
                 self,
                 'updated_at_utc',
-                self.updated_at_utc.replace(
-                    tzinfo=ZoneInfo('UTC')))
+                self.updated_at_utc.replace(tzinfo=_UTC))
 
     def to_ny_time(self) -> Optional[datetime]:
         """Convert UTC timestamp to America/New_York timezone"""
         if not self.updated_at_utc:
             return None
-        return self.updated_at_utc.astimezone(ZoneInfo('America/New_York'))
+        return self.updated_at_utc.astimezone(_NY_TZ)
 
     def speed_mph(self) -> int:
         """Extract integer speed in mph from status or return 0"""
         if not self.status:
             return 0
 
+        # Stationary states carry no speed, skip the regex for them
+        if self.status.strip().lower() in _ZERO_SPEED_STATUSES:
+            return 0
+
         # Try to extract speed from various status formats
-        import re
-        speed_match = re.search(r'(\d+)\s*mph', self.status.lower())
+        speed_match = _SPEED_RE.search(self.status)
         if speed_match:
             return int(speed_match.group(1))
 
-        # Default to 0 for stationary states
-        if any(word in self.status.lower()
-               for word in ['idle', 'stopped', 'parked']):
-            return 0
-
         return 0
@@ -5,8 +5,8 @@ Fuzzy VIN Matcher - Robust driver name extraction and VIN suggestion for Telegra
 
 import re
 import logging
-from typing import List, Tuple, Set
-from rapidfuzz import fuzz
+from typing import List, Optional, Tuple, Set
+from rapidfuzz import fuzz, process
 
 logger = logging.getLogger(__name__)
 
@@ -154,10 +154,17 @@ def build_assets_index(
     return assets
 
 
+def normalize_assets_names(assets: List[Tuple[str, str]]) -> List[str]:
+    """normalize_name for each assets driver name, in assets order"""
+    return [normalize_name(driver_name) for driver_name, _ in assets]
+
+
 def top_matches_for_name(
-        name: str, assets: List[Tuple[str, str]], k: int = 5) -> List[Tuple[str, str, int]]:
+        name: str, assets: List[Tuple[str, str]], k: int = 5,
+        choices: Optional[List[str]] = None) -> List[Tuple[str, str, int]]:
     """
-    Find top fuzzy matches for a name against assets driver names
+    Find top fuzzy matches for a name against assets driver names.
+    Pass choices from normalize_assets_names to reuse them across queries.
 
     Returns:
         List of (driver_name, vin, score) tuples, sorted by score descending
@@ -175,20 +182,18 @@ def top_matches_for_name(
     if not normalized_query:
         return []
 
-    scored_matches = []
-
-    for driver_name, vin in assets:
-        normalized_driver = normalize_name(driver_name)
-
-        # Use token_set_ratio for better partial matching
-        score = fuzz.token_set_ratio(normalized_query, normalized_driver)
+    if choices is None:
+        choices = normalize_assets_names(assets)
 
-        if score > 0:  # Include all non-zero scores for ranking
-            scored_matches.append((driver_name, vin, score))
+    # Use token_set_ratio for better partial matching; process.extract
+    # scores and ranks in C and returns the top k by score descending
+    results = process.extract(
+        normalized_query, choices, scorer=fuzz.token_set_ratio,
+        processor=None, limit=k)
 
-    # Sort by score descending and return top k
-    scored_matches.sort(key=lambda x: x[2], reverse=True)
-    return scored_matches[:k]
+    # Include all non-zero scores for ranking
+    return [(*assets[index], score)
+            for _, score, index in results if score > 0]
 
 
 def shortlist_for_group_title(
@@ -213,9 +218,11 @@ def shortlist_for_group_title(
 
     all_matches = []
     seen_vins = set()
+    # Normalize the assets names once for every extracted name
+    choices = normalize_assets_names(assets)
 
     for name in extracted_names:
-        matches = top_matches_for_name(name, assets, k_each)
+        matches = top_matches_for_name(name, assets, k_each, choices)
         logger.debug(
             f"Top matches for '{name}': {[(d, v, s) for d, v, s in matches[:3]]}")
 
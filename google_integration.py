@@ -1,10 +1,17 @@
 import os
+import re
 import logging
+import unicodedata
+from collections import Counter
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import List, Dict, Optional, Tuple, Any
 
 try:
     import gspread
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
+    from requests.adapters import HTTPAdapter
     GSPREAD_AVAILABLE = True
 except ImportError:
     GSPREAD_AVAILABLE = False
@@ -23,6 +30,13 @@ except ImportError:
     logger.warning("Column mapping utilities not available")
     COLUMN_MAPPING_AVAILABLE = False
 
+try:
+    from rapidfuzz import fuzz as rf_fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    rf_fuzz = None
+
 # Import rate limiting wrapper
 try:
     from rate_limiting_wrapper import RateLimitedSheetsWrapper
@@ -36,14 +50,22 @@ except ImportError:
 class GoogleSheetsIntegration:
     """Enhanced Google Sheets integration with QC PANEL → assets sync"""
 
+    # Max names scored by RapidFuzz after the trigram shortlist
+    DRIVER_SUGGESTION_SHORTLIST = 50
+
     def __init__(self, config: Config):
         self.config = config
         self.gc = None
+        self.authed_session = None
         self.spreadsheet = None
         self.assets_worksheet = None
         self.groups_worksheet = None
         self.dashboard_logs_worksheet = None
         self.fleet_status_worksheet = None
+        self.geocode_cache_worksheet = None
+        # address_key -> sheet row number, so re-cached addresses are
+        # updated in place instead of appended again
+        self._geocode_cache_rows: Dict[str, int] = {}
 
         # QC Panel integration
         self.qc_panel_spreadsheet = None
@@ -52,6 +74,17 @@ class GoogleSheetsIntegration:
         self.last_fetch_time = None
         self.cached_driver_names = []
         self.cache_duration = timedelta(minutes=5)
+        # VIN -> driver name / (driver, phone) from raw assets rows, rebuilt
+        # when _get_assets_values hands back a fresh rows list
+        self._vin_to_driver = {}
+        self._vin_to_driver_source = None
+        self._vin_contact_index = {}
+        self._vin_contact_source = None
+        # Normalized driver name -> VIN, built with cached_driver_names
+        self._driver_to_vin = {}
+        # Trigram index over cached_driver_names for suggestions
+        self._driver_name_index = None
+        self._driver_name_index_source = None
         self._active_cache = {}
         self._active_cache_ts = None
 
@@ -61,6 +94,24 @@ class GoogleSheetsIntegration:
         self._groups_records_cache_duration = timedelta(
             seconds=30)  # Short cache to reduce repeated calls
 
+        # Assets VIN/driver index (parallel lists + counts) for validation
+        self._assets_index_cache = None
+        self._assets_index_cache_ts = None
+        self._assets_index_cache_duration = timedelta(seconds=60)
+
+        # Raw assets rows (get_all_values) shared by the VIN/driver lookups,
+        # dropped whenever the bot itself writes to the assets sheet
+        self._assets_values_cache = None
+        self._assets_values_cache_ts = None
+        self._assets_values_cache_duration = timedelta(
+            seconds=getattr(config, 'SHEETS_CACHE_DEFAULT_TTL', 300))
+
+        # TMS trucks + existing assets VINs snapshot shared by
+        # list_new_trucks_found / add_new_truck_to_assets
+        self._tms_snapshot = None
+        self._tms_snapshot_ts = None
+        self._tms_snapshot_duration = timedelta(seconds=120)
+
         # Rate limiting
         self.rate_limiter = None
         if RATE_LIMITING_AVAILABLE:
@@ -104,6 +155,20 @@ class GoogleSheetsIntegration:
             logger.error(f"Failed to initialize sheets model: {e}")
             self.sheets_model = None
 
+    def _build_client(self, service_account_file: str):
+        """Create a gspread client backed by one keep-alive AuthorizedSession.
+
+        The session (and its cached OAuth token, refreshed only on expiry) is
+        stored on ``self`` and reused for the life of the process. The
+        connection pool is sized for concurrent ``asyncio.to_thread`` calls.
+        """
+        credentials = Credentials.from_service_account_file(
+            service_account_file, scopes=gspread.auth.DEFAULT_SCOPES)
+        self.authed_session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.authed_session.mount("https://", adapter)
+        return gspread.Client(auth=credentials, session=self.authed_session)
+
     def _initialize_connection(self):
         """Initialize Google Sheets connection with enhanced error handling"""
         if not GSPREAD_AVAILABLE:
@@ -120,8 +185,8 @@ class GoogleSheetsIntegration:
 
             logger.info(f"Using service account file: {service_account_file}")
 
-            # Initialize gspread client
-            self.gc = gspread.service_account(filename=service_account_file)
+            # Initialize gspread client on a long-lived pooled session
+            self.gc = self._build_client(service_account_file)
 
             # Open the main spreadsheet
             self.spreadsheet = self.gc.open_by_key(self.config.SPREADSHEET_ID)
@@ -176,6 +241,9 @@ class GoogleSheetsIntegration:
                 self._initialize_dashboard_logs_worksheet()
                 self._initialize_fleet_status_worksheet()
 
+            # Persistent geocode cache (optional, failures are non-fatal)
+            self._initialize_geocode_cache_worksheet()
+
         except Exception as e:
             logger.error(f"Failed to initialize worksheets: {e}")
             raise
@@ -204,6 +272,12 @@ class GoogleSheetsIntegration:
                 logger.debug(
                     "Applied rate limiting to dashboard_logs worksheet")
 
+            if self.geocode_cache_worksheet:
+                self.geocode_cache_worksheet = self.rate_limiter.wrap_worksheet(
+                    self.geocode_cache_worksheet)
+                logger.debug(
+                    "Applied rate limiting to geocode_cache worksheet")
+
             # Also wrap QC Panel worksheets if available
             if self.qc_panel_spreadsheet:
                 # We'll wrap individual worksheets as they're accessed
@@ -318,6 +392,134 @@ class GoogleSheetsIntegration:
         except Exception as e:
             logger.error(f"Failed to initialize fleet status worksheet: {e}")
 
+    def _initialize_geocode_cache_worksheet(self):
+        """Initialize or create the persistent geocode cache worksheet"""
+        try:
+            worksheet_name = getattr(
+                self.config,
+                'SPREADSHEET_GEOCODE_CACHE',
+                'geocode_cache')
+
+            try:
+                self.geocode_cache_worksheet = self.spreadsheet.worksheet(
+                    worksheet_name)
+                logger.info(
+                    f"Geocode cache worksheet '{worksheet_name}' already exists")
+            except gspread.exceptions.WorksheetNotFound:
+                self.geocode_cache_worksheet = self.spreadsheet.add_worksheet(
+                    title=worksheet_name, rows=1000, cols=4
+                )
+                headers = ["address_key", "lng", "lat", "cached_at"]
+                self.geocode_cache_worksheet.update('A1', [headers])
+                logger.info(
+                    f"Created geocode cache worksheet '{worksheet_name}'")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize geocode cache worksheet: {e}")
+
+    def load_geocode_cache(
+            self, max_age_seconds: Optional[float] = None,
+            max_entries: Optional[int] = None
+    ) -> Dict[str, Tuple[List[float], datetime]]:
+        """
+        Read persisted geocode results as {address_key: ([lng, lat], cached_at)},
+        oldest first. Later rows win. Rows older than max_age_seconds are
+        dropped, and only the newest max_entries are kept. When that leaves
+        fewer rows than the sheet has, the sheet is rewritten with only the
+        kept rows.
+        """
+        if not self.geocode_cache_worksheet:
+            return {}
+
+        try:
+            rows = self.geocode_cache_worksheet.get_all_values()
+        except Exception as e:
+            logger.error(f"Error loading geocode cache: {e}")
+            return {}
+
+        cache = {}
+        for row in islice(rows, 1, None):
+            if len(row) < 4 or not row[0]:
+                continue
+            try:
+                coords = [float(row[1]), float(row[2])]
+                cached_at = datetime.strptime(row[3], '%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                continue
+            cache[row[0]] = (coords, cached_at)
+
+        if max_age_seconds is not None:
+            cutoff = datetime.now() - timedelta(seconds=max_age_seconds)
+            cache = {key: entry for key, entry in cache.items()
+                     if entry[1] >= cutoff}
+        cache = dict(sorted(cache.items(), key=lambda item: item[1][1]))
+        if max_entries is not None and len(cache) > max_entries:
+            cache = dict(islice(cache.items(), len(cache) - max_entries, None))
+
+        self._geocode_cache_rows = {
+            row[0]: i for i, row in enumerate(rows[1:], start=2) if row}
+        data_rows = max(len(rows) - 1, 0)
+        if len(cache) < data_rows:
+            self._rewrite_geocode_cache(rows[0] if rows else None, cache, len(rows))
+            logger.info(
+                f"Pruned geocode cache sheet from {data_rows} to {len(cache)} rows")
+
+        logger.info(f"Loaded {len(cache)} persisted geocode results")
+        return cache
+
+    def _rewrite_geocode_cache(
+            self,
+            headers: Optional[List[str]],
+            cache: Dict[str, Tuple[List[float], datetime]],
+            old_row_count: int):
+        """
+        Overwrite the geocode cache sheet with one row per live key, then
+        clear the old rows left below them. The new rows are written first so
+        a failed write leaves the old contents in place.
+        """
+        values = [headers or ["address_key", "lng", "lat", "cached_at"]]
+        values.extend(
+            [key, coords[0], coords[1], cached_at.strftime('%Y-%m-%d %H:%M:%S')]
+            for key, (coords, cached_at) in cache.items())
+        try:
+            self.geocode_cache_worksheet.update('A1', values)
+        except Exception as e:
+            logger.error(f"Error pruning geocode cache sheet: {e}")
+            return
+
+        self._geocode_cache_rows = {
+            key: i for i, key in enumerate(cache, start=2)}
+        if old_row_count > len(values):
+            try:
+                self.geocode_cache_worksheet.batch_clear(
+                    [f'A{len(values) + 1}:D{old_row_count}'])
+            except Exception as e:
+                logger.error(f"Error clearing old geocode cache rows: {e}")
+
+    def save_geocode_cache_row(self, address_key: str, coords: List[float]) -> bool:
+        """Persist one geocode result, updating the key's row if it has one"""
+        if not self.geocode_cache_worksheet:
+            return False
+
+        row = [address_key, coords[0], coords[1],
+               datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        try:
+            row_num = self._geocode_cache_rows.get(address_key)
+            if row_num:
+                self.geocode_cache_worksheet.update(f'A{row_num}:D{row_num}', [row])
+                return True
+
+            response = self.geocode_cache_worksheet.append_row(row)
+            # e.g. "geocode_cache!A42:D42"
+            updated_range = (response or {}).get('updates', {}).get('updatedRange', '')
+            match = re.search(r'![A-Z]+(\d+)', updated_range)
+            if match:
+                self._geocode_cache_rows[address_key] = int(match.group(1))
+            return True
+        except Exception as e:
+            logger.error(f"Error saving geocode result for '{address_key}': {e}")
+            return False
+
     # =====================================================
     # QC PANEL → ASSETS SYNC IMPLEMENTATION
     # =====================================================
@@ -441,6 +643,24 @@ class GoogleSheetsIntegration:
                     return self._groups_records_cache
                 return []
 
+    def get_groups_sheet_snapshot(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Read the groups worksheet in a single values request and return
+        (headers, records), records built locally from the same response.
+        """
+        all_data = self.groups_worksheet.get_all_values()
+        if not all_data:
+            return [], []
+
+        headers = all_data[0]
+        # Same empty-header handling as the _get_groups_records_safe fallback
+        keys = [h.strip() for h in headers if h.strip()]
+        records = []
+        for row in islice(all_data, 1, None):
+            padded_row = row + [''] * (len(keys) - len(row))
+            records.append(dict(zip(keys, padded_row[:len(keys)])))
+        return headers, records
+
     def _invalidate_groups_cache(self):
         """Invalidate the groups records cache"""
         self._groups_records_cache = None
@@ -524,12 +744,13 @@ class GoogleSheetsIntegration:
                 is_current = parsed_date >= cutoff_date
                 
                 if not is_current:
-                    logger.debug(f"Appointment {appointment_str} is overdue (parsed: {parsed_date}, cutoff: {cutoff_date})")
+                    logger.debug("Appointment %s is overdue (parsed: %s, cutoff: %s)",
+                                 appointment_str, parsed_date, cutoff_date)
                 
                 return is_current
             else:
                 # Could not parse date, assume current
-                logger.debug(f"Could not parse appointment date: {appointment_str}")
+                logger.debug("Could not parse appointment date: %s", appointment_str)
                 return True
                 
         except Exception as e:
@@ -621,18 +842,19 @@ class GoogleSheetsIntegration:
                         # NEW: Check delivery appointment date - skip if delivery is overdue
                         del_appt = self._norm(r.get("DEL APT", ""))
                         if not self._is_appointment_current(del_appt):
-                            logger.debug(f"Skipping load {load_id} - delivery appointment is overdue: {del_appt}")
+                            logger.debug("Skipping load %s - delivery appointment is overdue: %s",
+                                         load_id, del_appt)
                             continue
 
                         # Skip duplicate load IDs (same load can't be in multiple places)
                         if load_id and load_id in processed_loads:
-                            logger.debug(f"Skipping duplicate load ID: {load_id}")
+                            logger.debug("Skipping duplicate load ID: %s", load_id)
                             continue
 
                         # Skip drivers already processed (1 driver = 1 active load)
                         driver_key = driver.lower().strip()
                         if driver_key in processed_drivers:
-                            logger.debug(f"Skipping driver {driver} - already has active load")
+                            logger.debug("Skipping driver %s - already has active load", driver)
                             continue
 
                         payload = {
@@ -709,6 +931,8 @@ class GoogleSheetsIntegration:
                 return 0
 
             ws = self.assets_worksheet
+            # Rows are updated by position, so read the sheet fresh
+            self._invalidate_assets_values()
             data = self._get_assets_records_safe()
 
             # Use column mapping for robust column access
@@ -781,7 +1005,7 @@ class GoogleSheetsIntegration:
                     for qc_driver_name, load_data in active.items():
                         if self._fuzzy_match_driver(qc_driver_name, drv):
                             src = load_data
-                            logger.debug(f"Fuzzy matched: QC '{qc_driver_name}' <-> Assets '{drv}'")
+                            logger.debug("Fuzzy matched: QC '%s' <-> Assets '%s'", qc_driver_name, drv)
                             break
                 
                 if not src:
@@ -808,6 +1032,7 @@ class GoogleSheetsIntegration:
 
             if updates:
                 ws.batch_update(updates)
+                self._invalidate_assets_values()
                 logger.info(
                     f"Synced {len(updates)} load data updates to assets sheet")
 
@@ -837,6 +1062,7 @@ class GoogleSheetsIntegration:
 
             # Update header row
             self.assets_worksheet.update('1:1', [new_headers])
+            self._invalidate_assets_values()
             logger.info(
                 f"Added missing columns to assets sheet: {[col_mapping.get(c, c) for c in missing_cols]}")
         except Exception as e:
@@ -900,6 +1126,29 @@ class GoogleSheetsIntegration:
     # EXISTING METHODS (unchanged)
     # =====================================================
 
+    @staticmethod
+    def _driver_key(name: str) -> str:
+        """Normalized driver-name key: NFKC, casefolded, single-spaced"""
+        return " ".join(unicodedata.normalize('NFKC', name).casefold().split())
+
+    def _get_assets_driver_vin_pairs(self) -> List[Tuple[Any, Any]]:
+        """
+        (driver_name, vin) for each assets row with a VIN. With column
+        mapping only those two columns are converted from the cached rows.
+        """
+        if self.use_column_mapping and self.assets_mapper:
+            try:
+                all_data = self._get_assets_values()
+                columns = self.assets_mapper.build_columnar(
+                    all_data[1:], fields=('driver_name', 'vin'))
+                return [(driver_name, vin) for driver_name, vin in
+                        zip(columns['driver_name'], columns['vin']) if vin]
+            except Exception as e:
+                logger.error(f"Error reading driver/VIN columns: {e}")
+
+        return [(record.get('driver_name', ''), record.get('vin') or record.get('VIN'))
+                for record in self._get_assets_records_safe()]
+
     def get_all_driver_names(self) -> List[str]:
         """Get all driver names from assets worksheet with enhanced caching"""
         try:
@@ -914,21 +1163,12 @@ class GoogleSheetsIntegration:
                     f"Using cached driver names ({len(self.cached_driver_names)} entries)")
                 return self.cached_driver_names
 
-            # Get all records from assets worksheet - use safe method
-            records = self._get_assets_records_safe()
-
             driver_names = []
             seen_names = set()
+            driver_to_vin = {}
 
-            for record in records:
-                # Use column mapping for robust access
-                if self.use_column_mapping and self.assets_mapper:
-                    driver_name = record.get('driver_name', '')
-                else:
-                    # Fallback to header-based access
-                    driver_name = record.get('driver_name', '')
-
-                driver_name = str(driver_name).strip()
+            for driver_name, vin in self._get_assets_driver_vin_pairs():
+                driver_name = str(driver_name or '').strip()
 
                 # Skip empty or obviously invalid names
                 if (driver_name and
@@ -940,8 +1180,15 @@ class GoogleSheetsIntegration:
                     driver_names.append(driver_name)
                     seen_names.add(driver_name)
 
+                # Exact-name -> VIN map for O(1) lookups (last row wins,
+                # as in DriverNameMatcher's cache)
+                vin = str(vin or '').strip().upper()
+                if driver_name and vin:
+                    driver_to_vin[self._driver_key(driver_name)] = vin
+
             # Update cache
             self.cached_driver_names = driver_names
+            self._driver_to_vin = driver_to_vin
             self.last_fetch_time = datetime.now()
 
             logger.info(
@@ -953,8 +1200,17 @@ class GoogleSheetsIntegration:
             return []
 
     def find_vin_by_driver_name(self, driver_name: str) -> Optional[str]:
-        """Find VIN by driver name using improved DriverNameMatcher"""
+        """Find VIN by driver name: exact normalized lookup, then DriverNameMatcher"""
         try:
+            # Fast path: exact (normalized) name from the cached assets data
+            if driver_name:
+                self.get_all_driver_names()  # refreshes _driver_to_vin if stale
+                vin = self._driver_to_vin.get(self._driver_key(driver_name))
+                if vin:
+                    logger.info(
+                        f"Driver match found: '{driver_name}' -> VIN: {vin}")
+                    return vin
+
             # Use the improved DriverNameMatcher
             from driver_name_matcher import DriverNameMatcher
 
@@ -978,167 +1234,204 @@ class GoogleSheetsIntegration:
                 f"Error finding VIN by driver name '{driver_name}': {e}")
             return None
 
+    @staticmethod
+    def _name_trigrams(name: str) -> set:
+        """Character trigrams of a lowercased, space-padded name"""
+        padded = f" {name.lower()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _get_driver_name_index(self) -> Tuple[List[str], Dict[str, set]]:
+        """
+        Full driver names (2+ words) plus a trigram -> name-index inverted
+        index, rebuilt only when the driver names cache is refreshed
+        """
+        driver_names = self.get_all_driver_names()
+        if (self._driver_name_index is not None and
+                self._driver_name_index_source is driver_names):
+            return self._driver_name_index
+
+        # Keep only full names for suggestions
+        full_names = [name for name in driver_names if len(name.split()) >= 2]
+        postings: Dict[str, set] = {}
+        for idx, name in enumerate(full_names):
+            for gram in self._name_trigrams(name):
+                postings.setdefault(gram, set()).add(idx)
+
+        self._driver_name_index = (full_names, postings)
+        self._driver_name_index_source = driver_names
+        return self._driver_name_index
+
     def find_similar_driver_names(self, search_name: str) -> List[str]:
-        """Find similar driver names for suggestions using improved DriverNameMatcher"""
-        try:
-            # Use the improved DriverNameMatcher
-            from driver_name_matcher import DriverNameMatcher
+        """Find similar driver names for suggestions using a trigram index + RapidFuzz"""
+        if not RAPIDFUZZ_AVAILABLE:
+            logger.warning(
+                "rapidfuzz not installed - driver name suggestions unavailable")
+            return []
 
-            # Create matcher instance
-            matcher = DriverNameMatcher(self)
+        try:
+            full_names, postings = self._get_driver_name_index()
+            if not full_names:
+                return []
 
-            # Get all driver names from the cache
-            all_driver_names = list(matcher.driver_vin_cache.keys())
-
-            # Filter out partial names (keep only full names for suggestions)
-            full_names = []
-            for name in all_driver_names:
-                # Skip partial names (single words that are likely first/last
-                # names)
-                if len(name.split()) >= 2:
-                    full_names.append(name)
-
-            # Use fuzzy matching to find similar names
-            from fuzzywuzzy import process
-
-            if full_names:
-                # Find top 10 matches
-                matches = process.extract(
-                    search_name,
-                    full_names,
-                    limit=10,
-                    scorer=lambda s1, s2: max(
-                        # Try different scoring methods
-                        process.fuzz.ratio(s1.lower(), s2.lower()),
-                        process.fuzz.partial_ratio(s1.lower(), s2.lower()),
-                        process.fuzz.token_sort_ratio(s1.lower(), s2.lower())
-                    )
+            # Shortlist names sharing the most trigrams with the query, then
+            # verify only those with the (C-implemented) RapidFuzz scorers
+            shared = Counter()
+            for gram in self._name_trigrams(search_name):
+                shared.update(postings.get(gram, ()))
+            if shared:
+                candidates = [full_names[idx] for idx, _ in
+                              shared.most_common(self.DRIVER_SUGGESTION_SHORTLIST)]
+            else:
+                candidates = full_names
+
+            query = search_name.lower()
+            scored = []
+            for name in candidates:
+                name_lower = name.lower()
+                score = max(
+                    # Try different scoring methods
+                    rf_fuzz.ratio(query, name_lower),
+                    rf_fuzz.partial_ratio(query, name_lower),
+                    rf_fuzz.token_sort_ratio(query, name_lower)
                 )
+                if score >= 60:  # Minimum 60% confidence
+                    scored.append((score, name))
 
-                # Filter by minimum confidence and return names
-                suggestions = []
-                for name, score in matches:
-                    if score >= 60:  # Minimum 60% confidence
-                        suggestions.append(name)
-
-                logger.info(
-                    f"Found {len(suggestions)} similar names for '{search_name}': {suggestions[:5]}")
-                return suggestions[:10]  # Return top 10
+            scored.sort(key=lambda item: item[0], reverse=True)
+            suggestions = [name for _, name in scored[:10]]  # Return top 10
 
-            return []
+            logger.info(
+                f"Found {len(suggestions)} similar names for '{search_name}': {suggestions[:5]}")
+            return suggestions
 
         except Exception as e:
             logger.error(
                 f"Error finding similar driver names for '{search_name}': {e}")
             return []
 
+    def _get_assets_values(self) -> List[List[str]]:
+        """Raw assets rows (header included), cached for a short TTL"""
+        now = datetime.now()
+        if (self._assets_values_cache is not None and self._assets_values_cache_ts and
+                now - self._assets_values_cache_ts < self._assets_values_cache_duration):
+            return self._assets_values_cache
+
+        self._assets_values_cache = self.assets_worksheet.get_all_values()
+        self._assets_values_cache_ts = now
+        return self._assets_values_cache
+
+    def _invalidate_assets_values(self):
+        """Drop the cached assets rows, including the rate limiter's copy"""
+        self._assets_values_cache = None
+        self._assets_values_cache_ts = None
+        invalidate = getattr(self.assets_worksheet, 'invalidate_cache', None)
+        if invalidate:
+            invalidate()
+
+    def _get_vin_contact_index(self) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """VIN -> (driver name, phone), rebuilt only when the assets rows refresh"""
+        all_data = self._get_assets_values()
+        if all_data is self._vin_contact_source:
+            return self._vin_contact_index
+
+        # HARDCODED COLUMN INDICES (to prevent future confusion):
+        # Column 4 (index 3): Driver Name
+        # Column 5 (index 4): VIN
+        # Column 12 (index 11): Phone
+        DRIVER_NAME_COL = 3
+        VIN_COL = 4
+        PHONE_COL = 11
+
+        index = {}
+        # Skip header row; first row per VIN wins, as with the old scan
+        for row_data in islice(all_data, 1, None):
+            if len(row_data) <= PHONE_COL:
+                continue
+            row_vin = str(row_data[VIN_COL]).upper().strip()
+            if row_vin in index:
+                continue
+
+            driver_name = str(row_data[DRIVER_NAME_COL]).strip()
+            # Handle multiple driver names (data quality fix) - take the
+            # first driver name when multiple names are present
+            if ' / ' in driver_name:
+                driver_name = driver_name.split(' / ')[0].strip()
+            phone = str(row_data[PHONE_COL]).strip()
+            index[row_vin] = (driver_name or None, phone or None)
+
+        self._vin_contact_index = index
+        self._vin_contact_source = all_data
+        logger.debug(f"Built VIN->contact index with {len(index)} entries")
+        return index
+
     def get_driver_contact_info_by_vin(
             self, vin: str) -> Tuple[Optional[str], Optional[str]]:
         """Get driver name and phone by VIN - HARDCODED column indices for reliability"""
         try:
-            # HARDCODED COLUMN INDICES (to prevent future confusion):
-            # Column 4 (index 3): Driver Name
-            # Column 5 (index 4): VIN
-            # Column 12 (index 11): Phone
-            DRIVER_NAME_COL = 3
-            VIN_COL = 4
-            PHONE_COL = 11
-
-            # Get raw data directly from worksheet
-            assets_worksheet = self.assets_worksheet
-            all_data = assets_worksheet.get_all_values()
+            contact = self._get_vin_contact_index().get(vin.upper().strip())
+            if contact:
+                logger.debug("Contact info for VIN %s: Driver: '%s', Phone: '%s'",
+                             vin, contact[0], contact[1])
+                return contact
 
-            if len(all_data) < 2:
-                return None, None
-
-            vin_upper = vin.upper().strip()
-
-            # Skip header row, search data rows
-            for row_data in all_data[1:]:
-                if len(row_data) > max(DRIVER_NAME_COL, VIN_COL, PHONE_COL):
-                    # Check VIN match using hardcoded column index
-                    row_vin = str(row_data[VIN_COL]).upper(
-                    ).strip() if len(row_data) > VIN_COL else ''
-
-                    if row_vin == vin_upper:
-                        # Get driver name using hardcoded column index
-                        driver_name = str(row_data[DRIVER_NAME_COL]).strip() if len(
-                            row_data) > DRIVER_NAME_COL else ''
-
-                        # Handle multiple driver names (data quality fix)
-                        if driver_name and ' / ' in driver_name:
-                            # Take the first driver name when multiple names
-                            # are present
-                            driver_name = driver_name.split(' / ')[0].strip()
-                            logger.debug(
-                                f"Multiple drivers found for VIN {vin}, using first: '{driver_name}'")
-
-                        # Get phone using hardcoded column index
-                        phone = str(row_data[PHONE_COL]).strip() if len(
-                            row_data) > PHONE_COL else ''
-
-                        logger.debug(
-                            f"Contact info for VIN {vin}: Driver: '{driver_name}', Phone: '{phone}'")
-                        return driver_name if driver_name else None, phone if phone else None
-
-            logger.debug(f"No contact info found for VIN: {vin}")
+            logger.debug("No contact info found for VIN: %s", vin)
             return None, None
 
         except Exception as e:
             logger.error(f"Error getting contact info for VIN {vin}: {e}")
             return None, None
 
-    def get_driver_name_by_vin(self, vin: str) -> Optional[str]:
-        """Get driver name by VIN - Updated for new assets sheet structure"""
-        try:
-            # UPDATED COLUMN INDICES for new assets sheet structure:
-            # Column 0: DRIVER FIRST NAME
-            # Column 1: DRIVER LAST NAME
-            # Column 2: VIN
-            FIRST_NAME_COL = 0
-            LAST_NAME_COL = 1
-            VIN_COL = 2
-
-            # Get raw data directly from worksheet
-            assets_worksheet = self.assets_worksheet
-            all_data = assets_worksheet.get_all_values()
+    def _get_vin_to_driver_index(self) -> Dict[str, str]:
+        """VIN -> driver name from the raw assets rows, rebuilt when they refresh"""
+        # Raw rows, shared with the other assets lookups
+        all_data = self._get_assets_values()
+        if all_data is self._vin_to_driver_source:
+            return self._vin_to_driver
+
+        # UPDATED COLUMN INDICES for new assets sheet structure:
+        # Column 0: DRIVER FIRST NAME
+        # Column 1: DRIVER LAST NAME
+        # Column 2: VIN
+        FIRST_NAME_COL = 0
+        LAST_NAME_COL = 1
+        VIN_COL = 2
+
+        vin_to_driver = {}
+        # Skip header row
+        for row_data in islice(all_data, 1, None):
+            if len(row_data) <= VIN_COL:
+                continue
+            row_vin = str(row_data[VIN_COL]).upper().strip()
+            if not row_vin or row_vin in vin_to_driver:
+                continue
+
+            # Combine first and last name
+            first_name = str(row_data[FIRST_NAME_COL]).strip()
+            last_name = str(row_data[LAST_NAME_COL]).strip()
+            driver_name = f"{first_name} {last_name}".strip()
+
+            # Handle multiple driver names (data quality fix) - take the
+            # first driver name when multiple names are present
+            if ' / ' in driver_name:
+                driver_name = driver_name.split(' / ')[0].strip()
 
-            if len(all_data) < 2:
-                return None
+            if driver_name:
+                vin_to_driver[row_vin] = driver_name
 
-            vin_upper = vin.upper().strip()
+        self._vin_to_driver = vin_to_driver
+        self._vin_to_driver_source = all_data
+        logger.debug(f"Built VIN->driver index with {len(vin_to_driver)} entries")
+        return vin_to_driver
 
-            # Skip header row, search data rows
-            for row_data in all_data[1:]:
-                if len(row_data) > VIN_COL:
-                    # Check VIN match
-                    row_vin = str(row_data[VIN_COL]).upper().strip() if len(row_data) > VIN_COL else ''
+    def get_driver_name_by_vin(self, vin: str) -> Optional[str]:
+        """Get driver name by VIN - Updated for new assets sheet structure"""
+        try:
+            driver_name = self._get_vin_to_driver_index().get(vin.upper().strip())
+            if driver_name:
+                logger.debug("Driver name for VIN %s: '%s'", vin, driver_name)
+                return driver_name
 
-                    if row_vin == vin_upper:
-                        # Get first and last name
-                        first_name = str(row_data[FIRST_NAME_COL]).strip() if len(row_data) > FIRST_NAME_COL else ''
-                        last_name = str(row_data[LAST_NAME_COL]).strip() if len(row_data) > LAST_NAME_COL else ''
-                        
-                        # Combine names
-                        if first_name or last_name:
-                            driver_name = f"{first_name} {last_name}".strip()
-                        else:
-                            driver_name = ''
-
-                        # Handle multiple driver names (data quality fix)
-                        if driver_name and ' / ' in driver_name:
-                            # Take the first driver name when multiple names
-                            # are present
-                            driver_name = driver_name.split(' / ')[0].strip()
-                            logger.debug(
-                                f"Multiple drivers found for VIN {vin}, using first: '{driver_name}'")
-
-                        if driver_name:
-                            logger.debug(
-                                f"Driver name for VIN {vin}: '{driver_name}'")
-                            return driver_name
-
-            logger.debug(f"No driver name found for VIN: {vin}")
+            logger.debug("No driver name found for VIN: %s", vin)
             return None
 
         except Exception as e:
@@ -1208,56 +1501,116 @@ class GoogleSheetsIntegration:
             vin: str,
             driver_name: Optional[str] = None) -> bool:
         """Save VIN for a group to groups worksheet"""
+        return self.save_group_vins([(group_id, group_title, vin)])
+
+    def save_group_vins(self, entries: List[Tuple[int, str, str]]) -> bool:
+        """
+        Upsert several (group_id, group_title, vin) registrations with one
+        groups read, one batch_update for existing rows and one append_rows
+        for new groups. Later entries for the same group win.
+        """
+        if not entries:
+            return True
+
         try:
             if not self.groups_worksheet:
                 logger.error("Groups worksheet not initialized")
                 return False
 
-            # Check if group already exists
+            # Existing group_id -> sheet row
             records = self._get_groups_records_safe()
-            existing_row = None
-
+            existing_rows = {}
             for i, record in enumerate(records):
-                if int(record.get('group_id', 0)) == group_id:
-                    existing_row = i + 2  # +2 because sheets are 1-indexed and we skip header
-                    break
+                try:
+                    # +2 because sheets are 1-indexed and we skip header
+                    existing_rows.setdefault(int(record.get('group_id', 0)), i + 2)
+                except (TypeError, ValueError):
+                    continue
 
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-            # Get driver name if not provided
-            if not driver_name and vin:
-                driver_name = self.get_driver_name_by_vin(vin)
-
             # Row data matching the actual headers: ['group_id', 'group_title',
             # 'vin', 'status', 'last_updated', 'error_count']
-            row_data = [
-                group_id,
-                group_title,
-                vin.upper(),
-                'ACTIVE',  # status
-                current_time,  # last_updated
-                0,  # error_count
-            ]
+            rows_by_group = {
+                group_id: [
+                    group_id,
+                    group_title,
+                    vin.upper(),
+                    'ACTIVE',  # status
+                    current_time,  # last_updated
+                    0,  # error_count
+                ]
+                for group_id, group_title, vin in entries
+            }
 
-            if existing_row:
-                # Update existing row
-                self.groups_worksheet.update(f'A{existing_row}', [row_data])
-                logger.info(f"Updated group {group_id} with VIN {vin}")
-            else:
-                # Add new row
-                self.groups_worksheet.append_row(row_data)
-                logger.info(f"Added new group {group_id} with VIN {vin}")
+            updates = [
+                {'range': f'A{existing_rows[group_id]}', 'values': [row]}
+                for group_id, row in rows_by_group.items()
+                if group_id in existing_rows]
+            new_rows = [
+                row for group_id, row in rows_by_group.items()
+                if group_id not in existing_rows]
+
+            if updates:
+                self.groups_worksheet.batch_update(updates)
+            if new_rows:
+                self.groups_worksheet.append_rows(new_rows)
+            logger.info(
+                "Saved group VINs: %d updated, %d added", len(updates), len(new_rows))
 
             # Invalidate cache since groups data changed
             self._invalidate_groups_cache()
             return True
 
         except Exception as e:
-            logger.error(f"Error saving group VIN for {group_id}: {e}")
+            logger.error("Error saving VINs for %d groups: %s", len(entries), e)
             return False
 
     # Enhanced logging functions
 
+    def build_dashboard_row(
+            self,
+            event_type: str,
+            user_id: int,
+            chat_id: int,
+            command: str,
+            vin: Optional[str] = None,
+            driver_name: Optional[str] = None,
+            success: bool = True,
+            error_message: Optional[str] = None,
+            duration_ms: int = 0,
+            session_data: Optional[str] = None) -> List[Any]:
+        """Build a dashboard logs row, timestamped now"""
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return [
+            current_time,
+            event_type,
+            user_id,
+            chat_id,
+            command,
+            vin or '',
+            driver_name or '',
+            'SUCCESS' if success else 'FAILED',
+            error_message or '',
+            duration_ms,
+            session_data or '',  # session_data for context
+            f'Event logged at {current_time}'
+        ]
+
+    def append_dashboard_rows(self, rows: List[List[Any]]) -> bool:
+        """Append several prebuilt dashboard rows in one Sheets request"""
+        if not rows or not self.enable_dashboard_logging or not self.dashboard_logs_worksheet:
+            return False
+
+        try:
+            self.dashboard_logs_worksheet.append_rows(rows)
+            logger.debug(f"Logged {len(rows)} dashboard events in one batch")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error logging {len(rows)} dashboard events: {e}")
+            return False
+
     def log_dashboard_event(
             self,
             event_type: str,
@@ -1275,22 +1628,11 @@ class GoogleSheetsIntegration:
             return False
 
         try:
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-            row_data = [
-                current_time,
-                event_type,
-                user_id,
-                chat_id,
-                command,
-                vin or '',
-                driver_name or '',
-                'SUCCESS' if success else 'FAILED',
-                error_message or '',
-                duration_ms,
-                session_data or '',  # session_data for context
-                f'Event logged at {current_time}'
-            ]
+            row_data = self.build_dashboard_row(
+                event_type, user_id, chat_id, command, vin=vin,
+                driver_name=driver_name, success=success,
+                error_message=error_message, duration_ms=duration_ms,
+                session_data=session_data)
 
             self.dashboard_logs_worksheet.append_row(row_data)
             logger.debug(
@@ -1389,19 +1731,24 @@ class GoogleSheetsIntegration:
         try:
             if self.use_column_mapping and self.assets_mapper:
                 # Use column mapping for robust access
-                all_data = self.assets_worksheet.get_all_values()
+                all_data = self._get_assets_values()
                 if len(all_data) < 2:
                     return []
 
                 data_rows = all_data[1:]  # Skip header row
-                records = []
 
-                for row in data_rows:
-                    # Convert row to dictionary using column mapping
-                    record = self.assets_mapper.create_row_dict(row)
-                    # Only include rows with valid VIN
-                    if record.get('vin'):
-                        records.append(record)
+                # Convert column by column, then zip back into per-row
+                # dicts, keeping only rows with a VIN
+                columns = self.assets_mapper.build_columnar(data_rows)
+                fields = list(columns)
+                if 'vin' not in columns:
+                    return []
+                vin_pos = fields.index('vin')
+                records = [
+                    dict(zip(fields, values))
+                    for values in zip(*columns.values())
+                    if values[vin_pos]
+                ]
 
                 logger.debug(
                     f"Retrieved {len(records)} assets records using column mapping")
@@ -1418,6 +1765,46 @@ class GoogleSheetsIntegration:
                 logger.error(f"Fallback method also failed: {fallback_e}")
                 return []
 
+    def get_assets_vin_index(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Return a cached column-oriented view of the assets sheet:
+        ``records``, parallel ``vins`` / ``drivers`` lists (normalized, rows
+        without VIN dropped), ``vin_counts`` (Counter) and ``vin_to_driver``
+        (first driver seen per VIN). Refreshed at most once per
+        _assets_index_cache_duration.
+        """
+        now = datetime.now()
+        if (not force_refresh and self._assets_index_cache is not None and
+                self._assets_index_cache_ts and
+                now - self._assets_index_cache_ts < self._assets_index_cache_duration):
+            return self._assets_index_cache
+
+        records = self._get_assets_records_safe()
+
+        vins = []
+        drivers = []
+        vin_to_driver = {}
+        for record in records:
+            # Column-mapped records use 'vin'/'driver_name', header-based
+            # records use the sheet headers
+            vin = str(record.get('vin') or record.get('VIN') or '').strip().upper()
+            if vin:
+                driver = str(record.get('driver_name') or record.get('Driver Name') or '').strip()
+                vins.append(vin)
+                drivers.append(driver)
+                vin_to_driver.setdefault(vin, driver)
+
+        index = {
+            'records': records,
+            'vins': vins,
+            'drivers': drivers,
+            'vin_counts': Counter(vins),
+            'vin_to_driver': vin_to_driver,
+        }
+        self._assets_index_cache = index
+        self._assets_index_cache_ts = now
+        return index
+
     def _get_assets_records_header_based(self):
         """Fallback method using header-based record retrieval"""
         try:
@@ -1429,7 +1816,7 @@ class GoogleSheetsIntegration:
                     "Working around header duplication issue in assets worksheet")
                 # Fallback to manual record creation
                 try:
-                    all_data = self.assets_worksheet.get_all_values()
+                    all_data = self._get_assets_values()
                     if len(all_data) < 2:
                         return []
 
@@ -1728,8 +2115,10 @@ class GoogleSheetsIntegration:
                 logger.info(f"Limited to {limit} trucks for this run")
 
             # Get existing assets records directly from worksheet to avoid
-            # column mapping issues
+            # column mapping issues; rows are written by position, so read
+            # the sheet fresh
             try:
+                self._invalidate_assets_values()
                 all_values = self.assets_worksheet.get_all_values()
                 if len(all_values) < 2:
                     return {"error": "Assets sheet has no data rows"}
@@ -1774,8 +2163,11 @@ class GoogleSheetsIntegration:
                 self.assets_worksheet,
                 chunk_size=200,
                 allow_new_trucks=False)
-            return writer.write_tms_data_to_assets(
-                trucks, existing_records, headers)
+            try:
+                return writer.write_tms_data_to_assets(
+                    trucks, existing_records, headers)
+            finally:
+                self._invalidate_assets_values()
 
         except Exception as e:
             logger.error(
@@ -1803,11 +2195,13 @@ class GoogleSheetsIntegration:
                 "sample_record": sample_record,
                 "total_records": len(records)}
 
-            logger.info("=== WORKSHEET DEBUG INFO ===")
-            logger.info(f"Header row: {header_row}")
-            logger.info(f"Available fields: {debug_info['available_fields']}")
-            logger.info(f"Sample record: {sample_record}")
-            logger.info("===========================")
+            # Skip formatting the sample rows when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("=== WORKSHEET DEBUG INFO ===")
+                logger.info(f"Header row: {header_row}")
+                logger.info(f"Available fields: {debug_info['available_fields']}")
+                logger.info(f"Sample record: {sample_record}")
+                logger.info("===========================")
 
             return debug_info
 
@@ -1815,14 +2209,50 @@ class GoogleSheetsIntegration:
             logger.error(f"Error debugging worksheet structure: {e}")
             return {"error": str(e)}
 
+    def _get_tms_assets_snapshot(self, force_refresh: bool = False):
+        """
+        Return (tms, trucks, existing_vins), reusing a snapshot younger than
+        _tms_snapshot_duration so a /listnewtrucks → /addtruck sequence only
+        hits TMS and the assets sheet once.
+        """
+        now = datetime.now()
+        if (not force_refresh and self._tms_snapshot is not None and
+                self._tms_snapshot_ts and
+                now - self._tms_snapshot_ts < self._tms_snapshot_duration):
+            return self._tms_snapshot
+
+        from tms_integration import TMSIntegration
+
+        tms = TMSIntegration(self.config)
+        trucks = tms.load_truck_list()
+
+        existing_vins = set()
+        for record in self._get_assets_records_safe():
+            vin = str(record.get('vin', '')).strip().upper()
+            if vin:
+                existing_vins.add(vin)
+
+        # Don't cache an empty TMS response
+        if trucks:
+            self._tms_snapshot = (tms, trucks, existing_vins)
+            self._tms_snapshot_ts = now
+        return tms, trucks, existing_vins
+
+    def _invalidate_tms_snapshot(self):
+        """Drop the cached TMS/assets snapshot after the assets sheet changes"""
+        self._tms_snapshot = None
+        self._tms_snapshot_ts = None
+
     def add_new_truck_to_assets(
-            self, vin: str, driver_name: str = None) -> Dict[str, Any]:
+            self, vin: str, driver_name: str = None,
+            force_refresh: bool = False) -> Dict[str, Any]:
         """
         Manually add a specific truck by VIN to the assets worksheet
 
         Args:
             vin: The VIN of the truck to add
             driver_name: Optional driver name (recommended for proper tracking)
+            force_refresh: Bypass the cached TMS/assets snapshot
 
         Returns:
             Dictionary with operation result
@@ -1831,13 +2261,9 @@ class GoogleSheetsIntegration:
             return {"error": "Assets worksheet not available"}
 
         try:
-            from tms_integration import TMSIntegration
-
-            # Initialize TMS integration
-            tms = TMSIntegration(self.config)
-
-            # Load current truck data from TMS
-            trucks = tms.load_truck_list()
+            # Load current truck data from TMS (shared short-lived snapshot)
+            tms, trucks, existing_vins = self._get_tms_assets_snapshot(
+                force_refresh=force_refresh)
 
             if not trucks:
                 return {"error": "No truck data available from TMS"}
@@ -1856,12 +2282,9 @@ class GoogleSheetsIntegration:
                     "error": f"Truck with VIN {vin_upper} not found in TMS data"}
 
             # Check if truck already exists in assets
-            existing_records = self._get_assets_records_safe()
-            for record in existing_records:
-                existing_vin = str(record.get('vin', '')).strip().upper()
-                if existing_vin == vin_upper:
-                    return {
-                        "error": f"Truck with VIN {vin_upper} already exists in assets worksheet"}
+            if vin_upper in existing_vins:
+                return {
+                    "error": f"Truck with VIN {vin_upper} already exists in assets worksheet"}
 
             # Format truck info for consistent data
             truck_info = tms.format_truck_info(target_truck)
@@ -1893,6 +2316,8 @@ class GoogleSheetsIntegration:
 
             # Add the new row to the worksheet
             self.assets_worksheet.append_row(new_row)
+            self._invalidate_tms_snapshot()
+            self._invalidate_assets_values()
 
             logger.info(
                 f"Successfully added new truck VIN {vin_upper} to assets worksheet")
@@ -1910,12 +2335,15 @@ class GoogleSheetsIntegration:
             logger.error(f"Error adding new truck {vin}: {e}")
             return {"error": str(e)}
 
-    def list_new_trucks_found(self, limit: int = 20) -> Dict[str, Any]:
+    def list_new_trucks_found(
+            self, limit: int = 20,
+            force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get a list of trucks that are in TMS but not in assets worksheet
 
         Args:
             limit: Maximum number of new trucks to return
+            force_refresh: Bypass the cached TMS/assets snapshot
 
         Returns:
             Dictionary with new trucks information
@@ -1924,26 +2352,13 @@ class GoogleSheetsIntegration:
             return {"error": "Assets worksheet not available"}
 
         try:
-            from tms_integration import TMSIntegration
-
-            # Initialize TMS integration
-            tms = TMSIntegration(self.config)
-
-            # Load current truck data from TMS
-            trucks = tms.load_truck_list()
+            # Load TMS trucks and existing assets VINs (shared snapshot)
+            tms, trucks, existing_vins = self._get_tms_assets_snapshot(
+                force_refresh=force_refresh)
 
             if not trucks:
                 return {"error": "No truck data available from TMS"}
 
-            # Get existing assets VINs
-            existing_records = self._get_assets_records_safe()
-            existing_vins = set()
-
-            for record in existing_records:
-                vin = str(record.get('vin', '')).strip().upper()
-                if vin:
-                    existing_vins.add(vin)
-
             # Find new trucks
             new_trucks = []
             for truck in trucks:
@@ -2244,7 +2659,9 @@ def test_google_integration(config: Config) -> bool:
             df = pd.read_excel(excel_file_path)
             logger.info(f"Loaded {len(df)} vehicles from Excel")
             
-            # Get current assets data
+            # Get current assets data (fresh, since the whole sheet is
+            # rewritten from it)
+            self._invalidate_assets_values()
             all_values = self.assets_worksheet.get_all_values()
             if len(all_values) < 2:
                 return {"error": "Assets sheet is empty or has no data"}
@@ -2367,6 +2784,7 @@ def test_google_integration(config: Config) -> bool:
             
             self.assets_worksheet.clear()
             self.assets_worksheet.update('A1', all_data)
+            self._invalidate_assets_values()
             
             logger.info(f"Assets sheet updated - Updated: {updates_made}, New: {len(new_rows)}")
             
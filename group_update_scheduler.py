@@ -3,6 +3,7 @@ Group Update Scheduler - Hourly visible updates + 5-min silent refresh with jitt
 Implements exactly-once-ish delivery and central rate limiting.
 """
 import asyncio
+import html
 import logging
 import random
 import time
@@ -21,6 +22,15 @@ from data_contracts import FleetPoint
 
 logger = logging.getLogger(__name__)
 
+# Location update used when ENABLE_NEW_LOCATION_RENDERER is off
+_LEGACY_LOCATION_TEMPLATE = (
+    "🚛 <b>Location Update</b>\n\n"
+    "👤 <b>Driver:</b> {driver}\n"
+    "🛑 <b>Status:</b> {status}\n"
+    "📍 <b>Location:</b> {location}\n"
+    "🏃 <b>Speed:</b> {speed} mph\n"
+    "📡 <b>Updated:</b> {updated}")
+
 
 class GroupUpdateScheduler:
     """
@@ -179,30 +189,30 @@ class GroupUpdateScheduler:
             # Create VIN lookup map
             fleet_map = {fp.vin: fp for fp in fleet_points}
 
-            # Process each group with jitter and rate limiting
-            updates_sent = 0
-            updates_attempted = 0
-            updates_skipped = 0
-            
-            for group_data in active_groups:
-                updates_attempted += 1
-                try:
-                    send_result = await self._send_group_update(group_data, fleet_map)
-                    if send_result:  # Only count if actually sent
-                        updates_sent += 1
-                    else:
-                        updates_skipped += 1
+            # Send to all groups concurrently; telegram_semaphore bounds the
+            # sends in flight and a short jitter staggers their start
+            async def _update_one(group_data: Dict) -> bool:
+                await asyncio.sleep(random.uniform(0.5, 2.0))
+                return await self._send_group_update(group_data, fleet_map)
 
-                    # Add jitter between group updates
-                    jitter = random.uniform(0.5, 2.0)
-                    await asyncio.sleep(jitter)
+            results = await asyncio.gather(
+                *(_update_one(group_data) for group_data in active_groups),
+                return_exceptions=True)
 
-                except Exception as e:
+            updates_attempted = len(results)
+            updates_sent = 0
+            updates_skipped = 0
+            for group_data, result in zip(active_groups, results):
+                if isinstance(result, Exception):
                     updates_skipped += 1
                     logger.error(
-                        f"Error updating group {group_data.get('group_id')}: {e}")
+                        f"Error updating group {group_data.get('group_id')}: {result}")
                     self._record_failure()
-            
+                elif result:  # Only count if actually sent
+                    updates_sent += 1
+                else:
+                    updates_skipped += 1
+
             logger.info(f"Update summary: {updates_sent} sent, {updates_skipped} skipped, {updates_attempted} attempted")
 
             self.metrics['hourly_updates_sent'] += updates_sent
@@ -240,11 +250,11 @@ class GroupUpdateScheduler:
                 logger.debug("No fleet data for silent refresh")
                 return
 
-            # Update ELD_tracker sheet (F:K columns)
-            updated_count = await self._update_eld_tracker(fleet_points)
-
-            # Warm reverse geocode cache for new locations
-            warmed_count = await self._warm_geocode_cache(fleet_points)
+            # Update ELD_tracker sheet (F:K columns) while warming the
+            # reverse geocode cache for new locations
+            updated_count, warmed_count = await asyncio.gather(
+                self._update_eld_tracker(fleet_points),
+                self._warm_geocode_cache(fleet_points))
 
             self.metrics['silent_refreshes'] += 1
             duration = time.time() - start_time
@@ -416,14 +426,11 @@ class GroupUpdateScheduler:
             speed_mph=fleet_point.speed_mph(),
             updated_at_utc=fleet_point.updated_at_utc,
             location_str=location_str,
-            map_source=fleet_point.source,
-            idle_since_utc=fleet_point.idle_since_utc
+            map_source=fleet_point.source
         )
 
     def _build_legacy_location_message(self, fleet_point: FleetPoint) -> str:
         """Legacy message builder for rollback capability"""
-        import html
-
         # Get NY time with EDT/EST designation
         ny_time = fleet_point.to_ny_time()
         time_str = "Unknown"
@@ -456,13 +463,9 @@ class GroupUpdateScheduler:
             map_link = f"https://maps.google.com/?q={fleet_point.lat},{fleet_point.lon}"
 
         # Construct HTML message per old spec
-        message = f"""🚛 <b>Location Update</b>
-
-👤 <b>Driver:</b> {driver_name}
-🛑 <b>Status:</b> {status}
-📍 <b>Location:</b> {location}
-🏃 <b>Speed:</b> {speed_mph} mph
-📡 <b>Updated:</b> {time_str}"""
+        message = _LEGACY_LOCATION_TEMPLATE.format(
+            driver=driver_name, status=status, location=location,
+            speed=speed_mph, updated=time_str)
 
         if map_link:
             message += f"\n\n🗺️ <a href='{map_link}'>View on Map</a>"
@@ -477,22 +480,19 @@ class GroupUpdateScheduler:
                 logger.error("Google Sheets not initialized")
                 return 0
 
+            # gspread calls are blocking HTTP, keep them off the event loop
             try:
-                eld_worksheet = self.google.spreadsheet.worksheet(
-                    'assets')
+                eld_worksheet = await asyncio.to_thread(
+                    self.google.spreadsheet.worksheet, 'assets')
             except Exception as e:
                 logger.warning(f"assets sheet not found: {e}")
                 return 0
 
-            # Get existing data to match by VIN
+            # Read only the header row and the VIN column to match by VIN
             try:
-                all_data = eld_worksheet.get_all_values()
-                if len(all_data) < 2:
-                    logger.warning("assets sheet has no data rows")
-                    return 0
-
-                headers = [h.strip().lower() for h in all_data[0]]
-                data_rows = all_data[1:]
+                headers = [
+                    h.strip().lower()
+                    for h in await asyncio.to_thread(eld_worksheet.row_values, 1)]
 
                 # Find VIN column index (usually column A)
                 vin_col_idx = None
@@ -505,18 +505,23 @@ class GroupUpdateScheduler:
                     logger.error("VIN column not found in assets sheet")
                     return 0
 
+                vin_values = (await asyncio.to_thread(
+                    eld_worksheet.col_values, vin_col_idx + 1))[1:]
+                if not vin_values:
+                    logger.warning("assets sheet has no data rows")
+                    return 0
+
                 # Build VIN to row mapping
                 vin_to_row = {}
-                for i, row in enumerate(data_rows):
-                    if len(row) > vin_col_idx and row[vin_col_idx]:
-                        vin = str(row[vin_col_idx]).strip().upper()
-                        if vin:
-                            # +2 for header and 1-based indexing
-                            vin_to_row[vin] = i + 2
+                for i, value in enumerate(vin_values):
+                    vin = value.strip().upper()
+                    if vin:
+                        # +2 for header and 1-based indexing
+                        vin_to_row[vin] = i + 2
 
                 # Log VIN indexing statistics
                 logger.info(
-                    f"📊 assets sheet scan: {len(data_rows)} total rows, {len(vin_to_row)} valid VINs indexed")
+                    f"📊 assets sheet scan: {len(vin_values)} total rows, {len(vin_to_row)} valid VINs indexed")
                 logger.info(
                     f"🔍 VIN column found at index {vin_col_idx} (schema expects column E=4)")
 
@@ -587,19 +592,13 @@ class GroupUpdateScheduler:
 
                 updated_count += 1
 
-            # Execute batch update
+            # Execute batch update in one request
             if batch_updates:
-                # Split into chunks to avoid API limits
-                chunk_size = 50
-                for i in range(0, len(batch_updates), chunk_size):
-                    chunk = batch_updates[i:i + chunk_size]
-                    try:
-                        eld_worksheet.batch_update(chunk)
-                        # Small delay between chunks
-                        await asyncio.sleep(0.1)
-                    except Exception as e:
-                        logger.error(
-                            f"Batch update failed for chunk {i//chunk_size}: {e}")
+                try:
+                    await asyncio.to_thread(eld_worksheet.batch_update, batch_updates)
+                except Exception as e:
+                    logger.error(f"Batch update failed: {e}")
+                    return 0
 
                 # Enhanced logging with diagnostic information
                 total_tms_vins = len(fleet_points)
@@ -609,7 +608,7 @@ class GroupUpdateScheduler:
                 logger.info(
                     f"⚠️ Skipped {skipped_count} unknown VINs: {skipped_samples[:5]}")
                 logger.info(
-                    f"✅ Executed {len(batch_updates)} updates in {len(range(0, len(batch_updates), 50))} chunks")
+                    f"✅ Executed {len(batch_updates)} updates in one batch request")
                 logger.info(f"Updated {updated_count} records in assets sheet")
 
             return updated_count
@@ -669,6 +668,8 @@ class GroupUpdateScheduler:
                         f'E{row_num}', [['INACTIVE']])  # Status column
                     self.google.groups_worksheet.update(
                         f'J{row_num}', [[f'{reason} - {current_time}']])  # Notes column
+                    # The next tick must not see this group as active
+                    self.google._invalidate_groups_cache()
 
                     logger.info(f"Deactivated group {group_id}: {reason}")
                     break
@@ -6,6 +6,7 @@ import re
 import html
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict, Tuple
 from zoneinfo import ZoneInfo
 
@@ -18,6 +19,27 @@ logger = logging.getLogger(__name__)
 # Global cache for address lookups - in production use Redis
 _address_cache: Dict[str, Tuple[str, datetime]] = {}
 
+# Characters a bare coordinate string can contain
+_MULTI_COORD_CHARS = frozenset("0123456789.,- \t\n\r\f\v")
+_COORD_CHARS = _MULTI_COORD_CHARS | frozenset("()[]")
+_COORD_PAIR_RE = re.compile(
+    r'^[\(\[]?\s*-?\d+\.\d+\s*,\s*-?\d+\.\d+\s*[\)\]]?$')
+_SINGLE_COORD_RE = re.compile(r'^-?\d{2,3}\.\d{4,}$')
+
+_UTC = ZoneInfo('UTC')
+_NY_TZ = ZoneInfo('America/New_York')
+
+# Group location update; every field except the coordinates is HTML-escaped
+LOCATION_UPDATE_TEMPLATE = (
+    "🚛 <b>Location Update</b>\n\n"
+    "👤 <b>Driver:</b> {driver}\n"
+    "🛑 <b>Status:</b> {status}\n"
+    "📍 <b>Location:</b> {location}\n"
+    "🏃 <b>Speed:</b> {speed} mph\n"
+    "📡 <b>Updated:</b> {updated}\n\n"
+    "🗺️ <b>Coordinates:</b> {lat}, {lon}\n"
+    "🔗 <b>Map:</b> https://maps.google.com/?q={lat},{lon}")
+
 
 def is_latlon_like(s: str) -> bool:
     """
@@ -29,33 +51,25 @@ def is_latlon_like(s: str) -> bool:
 
     s_clean = s.strip()
 
-    # Pattern 1: Two decimal numbers separated by comma/space
-    # Examples: "40.72734708, -111.94709302", "40.7273,-111.9471"
-    coord_pattern = r'^-?\d+\.\d+\s*,\s*-?\d+\.\d+$'
-    if re.match(coord_pattern, s_clean):
-        return True
-
-    # Pattern 2: Just decimal numbers with minimal text
-    # Examples: "40.72734708", "-111.94709302"
-    single_coord = r'^-?\d{2,3}\.\d{4,}$'
-    if re.match(single_coord, s_clean):
-        return True
-
-    # Pattern 3: Coordinates with parentheses or brackets
-    # Examples: "(40.7273, -111.9471)", "[40.7273,-111.9471]"
-    bracket_coords = r'^[\(\[]?\s*-?\d+\.\d+\s*,\s*-?\d+\.\d+\s*[\)\]]?$'
-    if re.match(bracket_coords, s_clean):
-        return True
+    # Anything with a letter or other symbol is an address, no regex needed
+    if not _COORD_CHARS.issuperset(s_clean):
+        return False
 
     # Pattern 4: Multiple coordinate pairs (common TMS error)
     # Examples: "40.7273, -111.9471, 40.72734708, -111.94709302"
     if s_clean.count(',') >= 3:  # More than one coordinate pair
-        # Check if it's mostly numbers, commas, spaces, and decimals
-        clean_chars = re.sub(r'[-\d\.\s,]', '', s_clean)
-        if len(clean_chars) == 0:  # Only coordinate-like characters
-            return True
+        # Only coordinate-like characters, brackets not allowed here
+        return _MULTI_COORD_CHARS.issuperset(s_clean)
 
-    return False
+    # Pattern 1: Two decimal numbers separated by comma/space, optionally
+    # in parentheses or brackets
+    # Examples: "40.72734708, -111.94709302", "(40.7273, -111.9471)"
+    if _COORD_PAIR_RE.match(s_clean):
+        return True
+
+    # Pattern 2: Just decimal numbers with minimal text
+    # Examples: "40.72734708", "-111.94709302"
+    return _SINGLE_COORD_RE.match(s_clean) is not None
 
 
 def _clamp_coordinates(lat: float, lon: float) -> Tuple[float, float]:
@@ -122,21 +136,28 @@ def _render_timezone_aware_time(utc_dt: Optional[datetime]) -> str:
     if not utc_dt:
         return "Unknown"
 
-    # Ensure UTC timezone
+    # Naive timestamps are UTC; aware ones convert directly
     if utc_dt.tzinfo is None:
-        utc_dt = utc_dt.replace(tzinfo=ZoneInfo('UTC'))
-    elif utc_dt.tzinfo != ZoneInfo('UTC'):
-        utc_dt = utc_dt.astimezone(ZoneInfo('UTC'))
+        utc_dt = utc_dt.replace(tzinfo=_UTC)
 
     # Convert to NY timezone
-    ny_tz = ZoneInfo('America/New_York')
-    ny_time = utc_dt.astimezone(ny_tz)
+    ny_time = utc_dt if utc_dt.tzinfo is _NY_TZ else utc_dt.astimezone(_NY_TZ)
+
+    # Same as strftime('%Y-%m-%d %H:%M:%S %Z'); tzname() is EDT or EST
+    return (f"{ny_time.year:04d}-{ny_time.month:02d}-{ny_time.day:02d} "
+            f"{ny_time.hour:02d}:{ny_time.minute:02d}:{ny_time.second:02d} "
+            f"{ny_time.tzname()}")
 
-    # Get timezone name (EDT or EST based on DST)
-    tz_name = ny_time.strftime('%Z')
 
-    # Format with proper timezone label
-    return ny_time.strftime(f'%Y-%m-%d %H:%M:%S {tz_name}')
+@lru_cache(maxsize=1)
+def _render_settings() -> Tuple[int, int]:
+    """Coordinate decimals and address cache TTL, read from Config once"""
+    try:
+        config = Config()
+        return (getattr(config, 'RENDER_COORD_DECIMALS', 5),
+                getattr(config, 'LOCATION_ADDR_CACHE_TTL_SECS', 86400))
+    except (ImportError, AttributeError):
+        return 5, 86400
 
 
 def render_location_update(
@@ -158,22 +179,17 @@ def render_location_update(
     - No coordinate duplicates anywhere
     """
 
-    # Import config here to avoid circular imports
-    try:
-        from config import Config
-        config = Config()
-        coord_decimals = getattr(config, 'RENDER_COORD_DECIMALS', 5)
-        cache_ttl = getattr(config, 'LOCATION_ADDR_CACHE_TTL_SECS', 86400)
-    except (ImportError, AttributeError) as config_error:
-        coord_decimals = 5
-        cache_ttl = 86400
+    coord_decimals, cache_ttl = _render_settings()
 
     # Sanitize inputs
     driver = (driver or "Unknown Driver").strip()
     status = (status or "Unknown").strip()
 
-    # Clamp coordinates
+    # Clamp coordinates and format them once: they are both the address
+    # cache key and the displayed/linked coordinates
     lat, lon = _clamp_coordinates(lat, lon)
+    lat_str, lon_str = _format_coordinates(lat, lon, coord_decimals)
+    cache_key = f"{lat_str},{lon_str}"
 
     # Convert speed to integer mph
     speed_mph_int = max(0, int(round(speed_mph))) if speed_mph else 0
@@ -192,9 +208,6 @@ def render_location_update(
                 f"Rejecting lat/lon-like location_str: {location_clean}")
 
             # P2: Try cached reverse geocoding result
-            lat_str, lon_str = _format_coordinates(lat, lon, coord_decimals)
-            cache_key = f"{lat_str},{lon_str}"
-
             cached_addr = _get_cached_address(cache_key, cache_ttl)
             if cached_addr:
                 readable_location = cached_addr
@@ -206,9 +219,6 @@ def render_location_update(
                     f"Using fallback location for {cache_key}: {readable_location}")
     else:
         # No location_str provided - try cache then fallback
-        lat_str, lon_str = _format_coordinates(lat, lon, coord_decimals)
-        cache_key = f"{lat_str},{lon_str}"
-
         cached_addr = _get_cached_address(cache_key, cache_ttl)
         if cached_addr:
             readable_location = cached_addr
@@ -219,9 +229,6 @@ def render_location_update(
     if len(readable_location) > 80:
         readable_location = readable_location[:77] + "..."
 
-    # Format coordinates (always shown when lat/lon exist)
-    lat_str, lon_str = _format_coordinates(lat, lon, coord_decimals)
-
     # Format timestamp in America/New_York timezone
     time_str = _render_timezone_aware_time(updated_at_utc)
 
@@ -231,24 +238,24 @@ def render_location_update(
     location_safe = html.escape(readable_location)
 
     # Build message following exact specification
-    message = f"""🚛 <b>Location Update</b>
-
-👤 <b>Driver:</b> {driver_safe}
-🛑 <b>Status:</b> {status_safe}
-📍 <b>Location:</b> {location_safe}
-🏃 <b>Speed:</b> {speed_mph_int} mph
-📡 <b>Updated:</b> {time_str}
-
-🗺️ <b>Coordinates:</b> {lat_str}, {lon_str}
-🔗 <b>Map:</b> https://maps.google.com/?q={lat_str},{lon_str}"""
+    fields = {
+        'driver': driver_safe,
+        'status': status_safe,
+        'location': location_safe,
+        'speed': speed_mph_int,
+        'updated': time_str,
+        'lat': lat_str,
+        'lon': lon_str,
+    }
+    message = LOCATION_UPDATE_TEMPLATE.format_map(fields)
 
     # Ensure message is under Telegram's 4096 character limit
     if len(message) > 4096:
         # Truncate location further if needed
         excess = len(message) - 4090  # Leave some buffer
         if len(location_safe) > excess + 20:
-            location_truncated = location_safe[:-(excess + 3)] + "..."
-            message = message.replace(location_safe, location_truncated)
+            fields['location'] = location_safe[:-(excess + 3)] + "..."
+            message = LOCATION_UPDATE_TEMPLATE.format_map(fields)
 
     return message
 
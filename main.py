@@ -12,13 +12,11 @@ import sys
 import signal
 import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
-# Add current directory to path
-sys.path.append(str(Path(__file__).parent))
-
 
 # Enhanced imports with proper error handling
 try:
@@ -48,6 +46,9 @@ except ImportError:
     print("Warning: eta_service not available, continuing without ETA alerting")
     ETA_SERVICE_AVAILABLE = False
 
+# Worker threads behind asyncio.to_thread (blocking Sheets / TMS / ORS calls)
+BLOCKING_IO_WORKERS = 16
+
 # Global instances for signal handling
 app_instance = None
 scheduler_instance: Optional[GroupUpdateScheduler] = None
@@ -250,6 +251,11 @@ def signal_handler(signum, frame):
                             app_instance,
                             'updater') and app_instance.updater:
                         await app_instance.updater.stop()
+                    # Write out queued group VINs and dashboard rows before the
+                    # loop goes away
+                    if enhanced_bot_instance:
+                        await enhanced_bot_instance.flush_group_vins()
+                        await enhanced_bot_instance.flush_dashboard_logs()
                     await app_instance.stop()
                     await app_instance.shutdown()
                     logger.info("Application stopped successfully")
@@ -659,6 +665,11 @@ async def run_enhanced_bot(config: Config):
 
     logger = logging.getLogger(__name__)
 
+    # Handlers push blocking Sheets/TMS calls through asyncio.to_thread; give
+    # them an explicitly sized pool instead of the CPU-count-based default
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+        max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io"))
+
     try:
         # Import here to avoid import issues
         from telegram_integration import build_application
@@ -917,6 +928,11 @@ async def run_enhanced_bot(config: Config):
                 # PTB v20 Application handles shutdown properly
                 if hasattr(app_instance, 'updater') and app_instance.updater:
                     await app_instance.updater.stop()
+                # Write out queued group VINs and dashboard rows before the
+                # loop goes away
+                if enhanced_bot_instance:
+                    await enhanced_bot_instance.flush_group_vins()
+                    await enhanced_bot_instance.flush_dashboard_logs()
                 await app_instance.stop()
                 await app_instance.shutdown()
                 logger.info("Enhanced application shutdown completed")
@@ -88,6 +88,15 @@ class RateLimitedSheetsWrapper:
         }
         return method_name in read_methods
 
+    def _is_write_method(self, method_name: str) -> bool:
+        """Determine if a method changes worksheet values (stales cached reads)"""
+        write_methods = {
+            'update', 'update_cell', 'update_cells', 'update_acell',
+            'batch_update', 'append_row', 'append_rows', 'insert_row',
+            'insert_rows', 'delete_row', 'delete_rows', 'clear', 'batch_clear'
+        }
+        return method_name in write_methods
+
     def _get_cache_ttl(self, method_name: str) -> int:
         """Get appropriate cache TTL based on method type"""
         # Longer cache for stable data
@@ -306,6 +315,18 @@ class RateLimitedWorksheet:
             'get_all_values', 'get_all_records', 'row_values'
         }
 
+        # Cache keys are scoped to this worksheet so two sheets' reads never
+        # share an entry, and tracked so a write can drop this sheet's reads
+        self._cache_scope = getattr(worksheet, 'id', id(worksheet))
+        self._cache_keys = set()
+
+    def invalidate_cache(self):
+        """Drop every cached read of this worksheet"""
+        with self._rate_limiter.cache_lock:
+            for key in self._cache_keys:
+                self._rate_limiter.cache.pop(key, None)
+        self._cache_keys.clear()
+
     def __getattr__(self, name):
         """Intercept method calls and apply rate limiting"""
         attr = getattr(self._worksheet, name)
@@ -319,7 +340,7 @@ class RateLimitedWorksheet:
 
                 # Try to get from cache first
                 cache_key = self._rate_limiter._get_cache_key(
-                    name, args, kwargs)
+                    name, (self._cache_scope,) + args, kwargs)
                 cached_result = self._rate_limiter._get_from_cache(cache_key)
 
                 if cached_result is not None:
@@ -332,12 +353,17 @@ class RateLimitedWorksheet:
                 # Store in cache
                 ttl = self._rate_limiter._get_cache_ttl(name)
                 self._rate_limiter._store_in_cache(cache_key, result, ttl)
+                self._cache_keys.add(cache_key)
 
                 return result
             else:
-                # Non-cacheable methods (writes, updates, etc.)
-                return self._rate_limiter._execute_with_retry(
+                # Non-cacheable methods (writes, uncached reads, etc.)
+                result = self._rate_limiter._execute_with_retry(
                     attr, name, *args, **kwargs)
+                # Cached reads of this worksheet are stale once it changes
+                if self._rate_limiter._is_write_method(name):
+                    self.invalidate_cache()
+                return result
 
         return rate_limited_method
 
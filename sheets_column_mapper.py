@@ -30,21 +30,33 @@ class SheetsColumnMapper:
 
         self.mappings = self.column_mapper.get_all_mappings(
             worksheet_type) if self.column_mapper else {}
+        # field -> (column index, mapping), resolved once for row reads
+        self._field_columns = {
+            field_name: (mapping.column_index, mapping)
+            for field_name, mapping in self.mappings.items()}
 
     def get_value_by_field(self, row: List[Any], field_name: str) -> Any:
         """Get value from row by field name"""
-        mapping = self.mappings.get(field_name)
-        if not mapping:
+        column = self._field_columns.get(field_name)
+        if not column:
             logger.warning(
                 f"Unknown field '{field_name}' for worksheet {self.worksheet_type.value}")
             return None
 
-        if mapping.column_index >= len(row):
+        index, mapping = column
+        if index >= len(row):
             logger.debug(
-                f"Row too short for column {mapping.column_letter} (index {mapping.column_index})")
+                f"Row too short for column {mapping.column_letter} (index {index})")
             return None
 
-        value = row[mapping.column_index]
+        return self._cell_value(row[index], mapping)
+
+    def _cell_value(self, value: Any, mapping: ColumnMapping) -> Any:
+        """_convert_value with the common empty and string cases inline"""
+        if value is None or value == '':
+            return None
+        if mapping.data_type == 'string':
+            return str(value).strip()
         return self._convert_value(value, mapping)
 
     def set_value_by_field(
@@ -73,10 +85,11 @@ class SheetsColumnMapper:
         row[mapping.column_index] = self._format_value(value, mapping)
         return True
 
-    def create_row_dict(self, row: List[Any]) -> Dict[str, Any]:
-        """Convert row to dictionary using field names"""
+    def create_row_dict(self, row: List[Any],
+                        fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """Convert row to dictionary using field names (only fields, if given)"""
         result = {}
-        for field_name, mapping in self.mappings.items():
+        for field_name in (self.mappings if fields is None else fields):
             if field_name == 'driver_name':
                 # Special handling for driver name - combine first and last name
                 first_name = row[0] if len(row) > 0 else ''
@@ -87,6 +100,50 @@ class SheetsColumnMapper:
                 result[field_name] = self.get_value_by_field(row, field_name)
         return result
 
+    def build_columnar(self, rows: List[List[Any]],
+                       fields: Optional[Tuple[str, ...]] = None) -> Dict[str, List[Any]]:
+        """
+        Column-oriented create_row_dict over many rows: field -> list of
+        values, one per row, converting each column in a single pass.
+        Pass fields to convert only those columns.
+        """
+        field_columns = self._field_columns
+        unknown = ()
+        if fields is not None:
+            # Unknown names get all-None columns, as get_value_by_field
+            # returns None for them
+            unknown = [name for name in fields if name not in field_columns]
+            for name in unknown:
+                logger.warning(
+                    f"Unknown field '{name}' for worksheet {self.worksheet_type.value}")
+            field_columns = {name: field_columns[name] for name in fields
+                             if name in field_columns}
+        if not rows:
+            return {field_name: [] for field_name in (
+                field_columns if fields is None else fields)}
+
+        # Pad short rows so zip(*rows) keeps every mapped column
+        width = max([2] + [index + 1 for index, _ in field_columns.values()])
+        columns = list(zip(*(
+            row if len(row) >= width else list(row) + [''] * (width - len(row))
+            for row in rows)))
+
+        cell_value = self._cell_value
+        result = {}
+        for field_name, (index, mapping) in field_columns.items():
+            if field_name == 'driver_name':
+                # Same first + last name combination as create_row_dict
+                result[field_name] = [
+                    f"{first} {last}".strip() or None
+                    for first, last in zip(columns[0], columns[1])]
+            else:
+                result[field_name] = [
+                    cell_value(value, mapping) for value in columns[index]]
+        if unknown:
+            result.update((name, [None] * len(rows)) for name in unknown)
+            result = {name: result[name] for name in fields}
+        return result
+
     def create_row_from_dict(self, data: Dict[str, Any]) -> List[Any]:
         """Create row from dictionary"""
         # Find maximum column index
@@ -8,11 +8,13 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Iterable, Optional, Any, Tuple
 from zoneinfo import ZoneInfo
 from dataclasses import dataclass
+from functools import lru_cache
 import time
 import hashlib
 
 from data_contracts import FleetPoint
 from config import Config
+from column_mapping_config import COLUMN_LETTERS
 
 
 logger = logging.getLogger(__name__)
@@ -108,6 +110,26 @@ SHEET_SCHEMAS = {
 }
 
 
+# Fallback header names tried by _find_header_column, per normalized target
+HEADER_ALTERNATIVES = {
+    'vin': ('vehicle_id', 'truck_id'),
+    'driver_name': ('driver', 'driver_name'),
+    'last_known_location': ('location', 'address', 'last_location'),
+    'update_time': ('updated', 'timestamp', 'last_updated'),
+    'group_id': ('chat_id', 'telegram_id'),
+}
+
+@lru_cache(maxsize=64)
+def _normalized_header_map(headers: Tuple[str, ...]) -> Dict[str, int]:
+    """Normalized header -> column index; a sheet's header row rarely changes"""
+    header_map = {}
+    for i, header in enumerate(headers):
+        header = header.strip()
+        if header:
+            header_map[header.lower().replace(' ', '_')] = i
+    return header_map
+
+
 class SheetsModelManager:
     """Comprehensive Sheets model manager with proper data governance"""
 
@@ -118,8 +140,10 @@ class SheetsModelManager:
         self.utc_tz = ZoneInfo('UTC')
 
         # Outbox for deduplication (in production, use Redis)
-        self.location_logs_outbox: Dict[str, datetime] = {}
+        # Insertion-ordered, so the oldest entry is always first
+        self.location_logs_outbox: Dict[Tuple[int, str, str], datetime] = {}
         self.outbox_ttl = timedelta(hours=24)
+        self.outbox_max = 100_000
 
         # Performance metrics
         self.metrics = {
@@ -144,12 +168,8 @@ class SheetsModelManager:
         return ny_time.strftime(f'%Y-%m-%d %H:%M:%S {tz_name}')
 
     def _normalize_headers(self, headers: List[str]) -> Dict[str, int]:
-        """Create normalized header to column index mapping"""
-        return {
-            header.strip().lower().replace(' ', '_'): i
-            for i, header in enumerate(headers)
-            if header.strip()
-        }
+        """Create normalized header to column index mapping (shared, read-only)"""
+        return _normalized_header_map(tuple(headers))
 
     def _find_header_column(
             self, header_map: Dict[str, int], target: str) -> Optional[int]:
@@ -161,18 +181,9 @@ class SheetsModelManager:
             return header_map[target_norm]
 
         # Fuzzy matching for common variations
-        alternatives = {
-            'vin': ['vehicle_id', 'truck_id'],
-            'driver_name': ['driver', 'driver_name'],
-            'last_known_location': ['location', 'address', 'last_location'],
-            'update_time': ['updated', 'timestamp', 'last_updated'],
-            'group_id': ['chat_id', 'telegram_id'],
-        }
-
-        if target_norm in alternatives:
-            for alt in alternatives[target_norm]:
-                if alt in header_map:
-                    return header_map[alt]
+        for alt in HEADER_ALTERNATIVES.get(target_norm, ()):
+            if alt in header_map:
+                return header_map[alt]
 
         return None
 
@@ -308,7 +319,7 @@ class SheetsModelManager:
 
                     # Create batch updates
                     for col_idx, value in updates.items():
-                        col_letter = chr(65 + col_idx)  # Convert to A, B, C...
+                        col_letter = COLUMN_LETTERS[col_idx]
                         batch_updates.append({
                             'range': f'{col_letter}{row_num}',
                             'values': [[value]]
@@ -496,12 +507,12 @@ class SheetsModelManager:
 
                     # Update title and timestamp
                     updates = [
-                        {'range': f'{chr(65 + title_col)}{i}', 'values': [[new_title]]}
+                        {'range': f'{COLUMN_LETTERS[title_col]}{i}', 'values': [[new_title]]}
                     ]
 
                     if updated_col is not None:
                         updates.append({
-                            'range': f'{chr(65 + updated_col)}{i}',
+                            'range': f'{COLUMN_LETTERS[updated_col]}{i}',
                             'values': [[self._get_ny_time()]]
                         })
 
@@ -525,14 +536,8 @@ class SheetsModelManager:
                 logger.warning("assets worksheet not available")
                 return 0
 
-            # Get all data to match by VIN
-            all_data = worksheet.get_all_values()
-            if len(all_data) < 2:
-                logger.warning("assets sheet has no data rows")
-                return 0
-
-            headers = all_data[0]
-            data_rows = all_data[1:]
+            # Only the header row and the VIN column are needed to match
+            headers = worksheet.row_values(1)
             header_map = self._normalize_headers(headers)
 
             # Find VIN column (should be column A)
@@ -541,13 +546,17 @@ class SheetsModelManager:
                 logger.error("VIN column not found in assets sheet")
                 return 0
 
+            vin_values = worksheet.col_values(vin_col + 1)[1:]
+            if not vin_values:
+                logger.warning("assets sheet has no data rows")
+                return 0
+
             # Build VIN to row mapping
             vin_to_row = {}
-            for i, row in enumerate(data_rows):
-                if len(row) > vin_col and row[vin_col]:
-                    vin = str(row[vin_col]).strip().upper()
-                    if vin:
-                        vin_to_row[vin] = i + 2  # +2 for header and 1-based
+            for i, value in enumerate(vin_values):
+                vin = value.strip().upper()
+                if vin:
+                    vin_to_row[vin] = i + 2  # +2 for header and 1-based
 
             # Prepare batch updates for F:K columns (indices 5-10)
             batch_updates = []
@@ -580,18 +589,13 @@ class SheetsModelManager:
                 })
                 updated_count += 1
 
-            # Execute batch update
+            # Execute batch update in one request
             if batch_updates:
-                # Split into chunks to avoid API limits
-                chunk_size = 50
-                for i in range(0, len(batch_updates), chunk_size):
-                    chunk = batch_updates[i:i + chunk_size]
-                    try:
-                        worksheet.batch_update(chunk)
-                        time.sleep(0.1)  # Rate limiting
-                    except Exception as e:
-                        logger.error(
-                            f"assets sheet batch update failed for chunk {i//chunk_size}: {e}")
+                try:
+                    worksheet.batch_update(batch_updates)
+                except Exception as e:
+                    logger.error(f"assets sheet batch update failed: {e}")
+                    return 0
 
                 logger.info(f"assets sheet updated: {updated_count} VINs")
 
@@ -670,7 +674,7 @@ class SheetsModelManager:
                     # Update existing row
                     row_num = vin_to_row[vin]
                     batch_updates.append({
-                        'range': f'A{row_num}:{chr(65 + len(fleet_row) - 1)}{row_num}',
+                        'range': f'A{row_num}:{COLUMN_LETTERS[len(fleet_row) - 1]}{row_num}',
                         'values': [fleet_row]
                     })
                 else:
@@ -679,22 +683,17 @@ class SheetsModelManager:
 
                 upserted_count += 1
 
-            # Execute updates
+            # Execute updates: at most one batch_update and one append_rows
             if batch_updates:
-                chunk_size = 25
-                for i in range(0, len(batch_updates), chunk_size):
-                    chunk = batch_updates[i:i + chunk_size]
-                    try:
-                        worksheet.batch_update(chunk)
-                        time.sleep(0.1)
-                    except Exception as e:
-                        logger.error(f"Fleet_status batch update failed: {e}")
+                try:
+                    worksheet.batch_update(batch_updates)
+                except Exception as e:
+                    logger.error(f"Fleet_status batch update failed: {e}")
 
             if new_rows:
                 try:
-                    for row in new_rows:
-                        worksheet.append_row(row)
-                        time.sleep(0.05)
+                    # RAW, like append_row and the batch_update above
+                    worksheet.append_rows(new_rows, value_input_option='RAW')
                 except Exception as e:
                     logger.error(
                         f"Failed to append new fleet_status rows: {e}")
@@ -723,13 +722,14 @@ class SheetsModelManager:
             if not self._ensure_worksheet_headers(worksheet, schema):
                 return 0
 
-            # Clean old outbox entries
+            # Clean old outbox entries from the front (oldest first)
+            outbox = self.location_logs_outbox
             cutoff = datetime.now(self.utc_tz) - self.outbox_ttl
-            old_keys = [
-                k for k,
-                v in self.location_logs_outbox.items() if v < cutoff]
-            for key in old_keys:
-                del self.location_logs_outbox[key]
+            while outbox:
+                oldest_key = next(iter(outbox))
+                if outbox[oldest_key] >= cutoff:
+                    break
+                del outbox[oldest_key]
 
             # Process events with deduplication
             new_rows = []
@@ -742,9 +742,10 @@ class SheetsModelManager:
                         'ts_utc_timestamp',
                         time.time()) //
                     300)  # 5-min buckets
-                outbox_key = f"{ts_bucket}|{event.get('VIN', '')}|{event.get('event_type', '')}"
+                outbox_key = (
+                    ts_bucket, event.get('VIN', ''), event.get('event_type', ''))
 
-                if outbox_key in self.location_logs_outbox:
+                if outbox_key in outbox:
                     logger.debug(
                         f"Skipping duplicate location log: {outbox_key}")
                     continue
@@ -772,16 +773,18 @@ class SheetsModelManager:
                 ]
 
                 new_rows.append(log_row)
-                self.location_logs_outbox[outbox_key] = datetime.now(
-                    self.utc_tz)
+                outbox[outbox_key] = datetime.now(self.utc_tz)
+                if len(outbox) > self.outbox_max:
+                    del outbox[next(iter(outbox))]
                 appended_count += 1
 
-            # Append new rows
+            # Append new rows in one request
             if new_rows:
                 try:
-                    for row in new_rows:
-                        worksheet.append_row(row)
-                        time.sleep(0.05)  # Rate limiting
+                    worksheet.append_rows(
+                        new_rows,
+                        value_input_option='RAW',
+                        insert_data_option='INSERT_ROWS')
                 except Exception as e:
                     logger.error(f"Failed to append location logs: {e}")
                     return 0
@@ -918,13 +921,9 @@ class SheetsModelManager:
                     "Location_logs worksheet not available for pruning")
                 return 0
 
-            # Get all data
-            all_data = worksheet.get_all_values()
-            if len(all_data) < 2:
-                return 0
-
-            headers = all_data[0]
-            data_rows = all_data[1:]
+            # Read only the header row and the ts_utc column, not the
+            # whole (large, append-only) sheet
+            headers = worksheet.row_values(1)
             header_map = self._normalize_headers(headers)
 
             ts_utc_col = self._find_header_column(header_map, 'ts_utc')
@@ -932,15 +931,19 @@ class SheetsModelManager:
                 logger.error("ts_utc column not found for pruning")
                 return 0
 
+            timestamps = worksheet.col_values(ts_utc_col + 1)[1:]
+            if not timestamps:
+                return 0
+
             # Find rows to delete (older than cutoff)
             cutoff_date = datetime.now(self.utc_tz) - timedelta(days=days)
             rows_to_delete = []
 
-            for i, row in enumerate(data_rows):
-                if len(row) > ts_utc_col and row[ts_utc_col]:
+            for i, ts_utc in enumerate(timestamps):
+                if ts_utc:
                     try:
                         row_date = datetime.fromisoformat(
-                            row[ts_utc_col].replace('Z', '+00:00'))
+                            ts_utc.replace('Z', '+00:00'))
                         if row_date < cutoff_date:
                             # +2 for header and 1-based
                             rows_to_delete.append(i + 2)
@@ -948,22 +951,33 @@ class SheetsModelManager:
                         # Skip rows with invalid timestamps
                         continue
 
-            # Delete in chunks (from bottom to top to maintain row numbers)
+            # Delete contiguous runs of old rows in one batch_update,
+            # bottom run first so earlier row numbers stay valid
             if rows_to_delete:
-                rows_to_delete.sort(reverse=True)
-                chunk_size = 50  # Delete in chunks to avoid API limits
-                deleted_count = 0
-
-                for i in range(0, len(rows_to_delete), chunk_size):
-                    chunk = rows_to_delete[i:i + chunk_size]
-                    for row_num in chunk:
-                        try:
-                            worksheet.delete_rows(row_num)
-                            deleted_count += 1
-                            time.sleep(0.1)  # Rate limiting
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to delete row {row_num}: {e}")
+                runs = []  # [start, end] 1-based, inclusive
+                for row_num in rows_to_delete:
+                    if runs and runs[-1][1] == row_num - 1:
+                        runs[-1][1] = row_num
+                    else:
+                        runs.append([row_num, row_num])
+
+                requests = [{
+                    'deleteDimension': {
+                        'range': {
+                            'sheetId': worksheet.id,
+                            'dimension': 'ROWS',
+                            'startIndex': start - 1,
+                            'endIndex': end,
+                        }
+                    }
+                } for start, end in reversed(runs)]
+                try:
+                    worksheet.spreadsheet.batch_update({'requests': requests})
+                    deleted_count = len(rows_to_delete)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to delete {len(rows_to_delete)} old location log rows: {e}")
+                    deleted_count = 0
 
                 self.metrics['retention_pruned'] += deleted_count
                 logger.info(
@@ -8,12 +8,18 @@ from telegram.ext import (
     MessageHandler, ConversationHandler, ContextTypes, filters
 )
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, Bot
-import pytz
-from functools import wraps
+from telegram.ext import AIORateLimiter
+from importlib.util import find_spec
+from zoneinfo import ZoneInfo
+from collections import Counter
+from functools import lru_cache, wraps
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import html
+import re
 import time
+import uuid
 import asyncio
 import logging
 from telegram.ext import ContextTypes
@@ -69,8 +75,35 @@ try:
 except ImportError:
     ETA_SERVICE_AVAILABLE = False
 
+# AIORateLimiter needs the python-telegram-bot[rate-limiter] extra (aiolimiter)
+RATE_LIMITER_AVAILABLE = find_spec("aiolimiter") is not None
+
 logger = logging.getLogger(__name__)
 
+# Eastern time, used for all user-facing timestamps
+NY_TZ = ZoneInfo("America/New_York")
+
+# Background dashboard logging: max queued rows, rows per Sheets append,
+# and seconds to wait for more rows before flushing a batch
+DASHBOARD_LOG_QUEUE_MAX = 10000
+DASHBOARD_LOG_BATCH_MAX = 50
+DASHBOARD_LOG_BATCH_WINDOW = 1.0
+# Seconds to wait at shutdown for queued dashboard rows to be written
+DASHBOARD_LOG_FLUSH_TIMEOUT = 10.0
+
+# Group VIN registrations: max upserts per Sheets batch and seconds to wait
+# for concurrent registrations to join it
+GROUP_VIN_BATCH_MAX = 50
+GROUP_VIN_BATCH_WINDOW = 0.2
+# Seconds to wait at shutdown for queued group VIN registrations to be saved
+GROUP_VIN_FLUSH_TIMEOUT = 10.0
+
+# Same VIN format rule as the sheet column mappings (column_mapping_config)
+VIN_RE = re.compile(r"^[A-Z0-9]{17}$")
+
+# Session cleanup yields to the event loop after this many sessions
+SESSION_CLEANUP_CHUNK = 1000
+
 # Conversation states
 ASK_DRIVER_NAME, ASK_VIN, ASK_STOP_LOCATION, ASK_APPOINTMENT = range(4)
 
@@ -90,6 +123,139 @@ CB_STOP_AUTO_REFRESH = "stop_auto_refresh"
 CB_START_AUTO_REFRESH = "start_auto_refresh"
 CB_BACK_TO_MAIN = "back_to_main"
 CB_BACK = "back"
+CB_RUN_GROUPS_DIAGNOSTIC = "run_groups_diagnostic"
+
+# Risk alert buttons (handle_risk_alert_callback), incl. ETA late acknowledgments
+RISK_CB_RE = re.compile(
+    r"^(?:contact_driver_|ack_alert_|escalate_alert_|ACK_LATE_DEL:|ACK_LATE_PU:)")
+
+# How long groups records fetched by /updateall stay reusable by the
+# "Run Diagnostic" button before a fresh read is required
+DIAG_RECORDS_TTL_SECONDS = 60
+
+# Outbound Telegram limits: ~30 msg/s per bot, 20 msg/min per group. Every
+# bot request goes through the rate limiter, which also retries 429s.
+TELEGRAM_OVERALL_MAX_RATE = 30
+TELEGRAM_GROUP_MAX_RATE = 20
+TELEGRAM_RATE_LIMIT_RETRIES = 3
+
+# Geocode results are reused across sessions (and restarts, via Sheets) for
+# this long
+GEOCODE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# Most geocode results kept in memory and in the geocode_cache sheet
+GEOCODE_CACHE_MAX_ENTRIES = 5000
+
+
+@lru_cache(maxsize=4096)
+def _norm_address(address: str) -> str:
+    """Geocode cache key: lowercased, whitespace collapsed"""
+    return " ".join(address.lower().split())
+
+
+def _ny_display_time(last_updated: Optional[datetime]) -> datetime:
+    """Session timestamps are naive UTC; show them in NY time (now if unset)"""
+    if last_updated is None:
+        return datetime.now(NY_TZ)
+    return last_updated.replace(tzinfo=timezone.utc).astimezone(NY_TZ)
+
+
+# Shared single-button keyboards (PTB markup objects are immutable, safe to reuse)
+BACK_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+BACK_TO_MAIN_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🏠 Back to Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+MAIN_MENU_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+SET_VIN_BACK_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🛠 Set VIN", callback_data=CB_SET_VIN)],
+    [InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)],
+])
+ETA_MAIN_MENU_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("↪️ Calculate ETA", callback_data=CB_CALCULATE_ETA)],
+    [InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)],
+])
+
+# Private-chat location card and its action keyboard. HTML, so only the
+# substituted values need escaping (driver names and addresses routinely
+# contain '_' or '*', which break legacy Markdown).
+PRIVATE_LOCATION_TEMPLATE = (
+    "📍 <b>Driver Location</b>\n\n"
+    "👤 <b>Driver:</b> {driver}\n"
+    "🚛 <b>Unit:</b> {vin}\n"
+    "<b>Speed:</b> {speed}\n"
+    "{emoji} <b>Status:</b> {status}\n"
+    "📍 <b>Location:</b> {location}\n"
+    "📡 <b>Updated:</b> {updated} ET\n"
+    "{warning}"
+    "\n🗺️ <a href=\"{map_url}\">View on Map</a>")
+# Same card without buttons, sent when building or sending the normal one fails
+PRIVATE_LOCATION_FALLBACK_TEMPLATE = (
+    PRIVATE_LOCATION_TEMPLATE +
+    "\n\n⚠️ Inline buttons unavailable due to error: {error}")
+PRIVATE_LOCATION_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📍 Set Stop Location", callback_data=CB_SEND_STOP),
+     InlineKeyboardButton("⏰ Set Appointment", callback_data=CB_SEND_APPOINTMENT)],
+    [InlineKeyboardButton("↪️ Calculate ETA", callback_data=CB_CALCULATE_ETA)],
+    [InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)],
+])
+
+# Moving → green, stopped → red
+MOVEMENT_STATUS_EMOJI = {True: "🟢", False: "🔴"}
+
+MANUAL_LOCATION_UPDATE_TEMPLATE = (
+    "🚛 **Manual Location Update**\n\n"
+    "👤 **Driver:** {driver_name}\n"
+    "🚛 **Unit:** {vin}\n"
+    "{emoji} **Status:** {status}\n"
+    "📍 **Location:** {location}\n"
+    "🏃 **Speed:** {speed}\n"
+    "📡 **Updated:** {ts}\n\n"
+    "🗺️ [View on Map](https://maps.google.com/?q={lat},{lng})")
+
+# Static reply bodies for the conversation handlers (legacy Markdown), built
+# once instead of per reply. The *_TEMPLATE ones take .format() fields.
+INVALID_VIN_TEXT = (
+    "⚠️ **Invalid VIN**\n\n"
+    "A VIN is 17 letters and digits. Please check it and try again.")
+VIN_NOT_FOUND_TEMPLATE = (
+    "⚠️ **VIN Not Found**\n\nVIN {vin} not found in TMS data.\n\n"
+    "Please check the VIN and try again.")
+REGISTRATION_FAILED_TEXT = (
+    "❌ **Registration Failed**\n\n"
+    "Could not save VIN to database. Please try again.")
+NO_APPOINTMENT_TEXT = "❌ **Error:** No appointment time provided."
+EMPTY_APPOINTMENT_TEXT = "❌ **Error:** Empty appointment time provided."
+INVALID_TIME_FORMAT_TEMPLATE = (
+    "⚠️ **Invalid Time Format**\n\n"
+    "Could not parse: {appointment}\n\n"
+    "**Try these formats:**\n"
+    "**Date & Time:**\n"
+    "• 2025-09-26 08:00\n"
+    "• 2025-09-26 8:00 AM\n"
+    "• 09/26/2025 2:30 PM\n"
+    "**Time Only:**\n"
+    "• 2:30 PM\n"
+    "• 08:15 AM\n"
+    "• 14:45")
+CANCELLED_TEXT = "🚫 **Operation Cancelled**\n\nReturning to main menu."
+# VIN accepted: the parts differ by whether hourly auto-updates could start
+VIN_SUCCESS_TEMPLATE = (
+    "✅ **VIN Set{suffix}**\n\n"
+    "🚛 **VIN:** {vin}\n"
+    "👤 **Driver:** {driver}\n"
+    "{auto_block}{risk_block}{hint}")
+VIN_SUCCESS_AUTO_PARTS = {
+    'suffix': " & Auto-Updates Started",
+    'auto_block': ("📍 **Hourly location updates:** ACTIVE\n"
+                   "🔄 **Next update:** ~1 hour\n"),
+    'hint': "\n💡 Use buttons in location updates for ETA tracking!",
+}
+VIN_SUCCESS_MANUAL_PARTS = {
+    'suffix': " Successfully",
+    'auto_block': "⚠️ **Auto-updates unavailable** (job queue error)\n\n",
+    'hint': "Use manual buttons for updates.",
+}
+VIN_SUCCESS_RISK_LINE = "🛡️ **Cargo theft monitoring:** ACTIVE\n"
 
 
 @dataclass
@@ -120,6 +286,79 @@ class SessionData:
     last_location: Optional[tuple] = None
     consecutive_stop_count: int = 0
 
+    def update_from(self, reg: 'GroupRegistration'):
+        """Mark this session as registered to reg's truck"""
+        self.vin = reg.vin
+        self.driver_name = reg.driver_name
+        self.is_group_registered = True
+
+
+@dataclass(frozen=True, slots=True)
+class GroupRegistration:
+    """A group's VIN registration, resolved once when the VIN is accepted"""
+    chat_id: int
+    title: str
+    vin: str
+    driver_name: Optional[str]
+
+
+# Appointment input: optional date (YYYY-MM-DD, MM/DD/YYYY or MM-DD-YYYY),
+# then H:MM with an optional AM/PM. The match picks the one strptime format.
+_APPOINTMENT_RE = re.compile(
+    r"^(?:(?P<date>\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4})\s+)?"
+    r"(?P<time>\d{1,2}:\d{2})\s*(?P<ampm>[AP]M)?$", re.IGNORECASE)
+_APPOINTMENT_DATE_FORMATS = {'iso': "%Y-%m-%d", '/': "%m/%d/%Y", '-': "%m-%d-%Y"}
+
+
+def _parse_appointment(text: str) -> Optional[datetime]:
+    """Parse an appointment time/datetime, or None if the input is not one"""
+    m = _APPOINTMENT_RE.match(text)
+    if not m:
+        return None
+    date, time_part, ampm = m.group('date', 'time', 'ampm')
+    value, fmt = time_part, "%H:%M"
+    if ampm:
+        value, fmt = f"{time_part} {ampm.upper()}", "%I:%M %p"
+    if date:
+        kind = 'iso' if date[4:5] == '-' else ('/' if '/' in date else '-')
+        value, fmt = f"{date} {value}", f"{_APPOINTMENT_DATE_FORMATS[kind]} {fmt}"
+    try:
+        return datetime.strptime(value, fmt)
+    except ValueError:  # e.g. 25:00 or month 13
+        return None
+
+
+# Driver-name button labels: max label length, and head/tail lengths kept
+# for "First / Second" multi-driver names
+_LABEL_MAX = 25
+_LABEL_HEAD = 15
+_LABEL_TAIL = 8
+
+# Longest error text echoed to the user (gspread errors carry whole HTTP bodies)
+ERROR_ECHO_MAX = 180
+
+
+def _truncate(text: str, width: int) -> str:
+    """Cut text to width, marking the cut with '...'"""
+    return text[:width] + "..." if len(text) > width else text
+
+
+def _short_err(e: Exception) -> str:
+    """Exception type and message, bounded for echoing back to the user"""
+    s = f"{type(e).__name__}: {e}"
+    return s[:ERROR_ECHO_MAX] + "…" if len(s) > ERROR_ECHO_MAX else s
+
+
+def _button_label(name: str) -> str:
+    """Shorten a driver name for an inline button, keeping both sides of ' / '"""
+    if len(name) <= _LABEL_MAX:
+        return name
+    head, sep, _ = name.partition(' / ')
+    if not sep:
+        return name[:_LABEL_MAX] + "..."
+    tail = name.rpartition(' / ')[2]
+    return f"{_truncate(head, _LABEL_HEAD)} / {_truncate(tail, _LABEL_TAIL)}"
+
 
 class EnhancedLocationBot(RiskDetectionMixin):
     """Enhanced bot with simplified group workflow, persistent ETA options, and cargo theft risk detection"""
@@ -178,7 +417,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     # Log the command execution
                     duration_ms = int((time.time() - start_time) * 1000)
                     try:
-                        self.google_integration.log_command_execution(
+                        self._log_command_in_background(
                             user_id=user_id,
                             chat_id=chat_id,
                             command=command_name,
@@ -195,6 +434,164 @@ class EnhancedLocationBot(RiskDetectionMixin):
             return wrapper
         return decorator
 
+    def _enqueue_dashboard_row(self, *args, **kwargs) -> None:
+        """
+        Build a dashboard row (build_dashboard_row args) and queue it for the
+        background writer, starting it if needed. No-op when dashboard
+        logging is disabled.
+        """
+        if not self.google_integration.enable_dashboard_logging:
+            return
+        row = self.google_integration.build_dashboard_row(*args, **kwargs)
+        try:
+            self._dashboard_log_queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Dashboard log queue full - dropping log row")
+            return
+
+        if self._dashboard_log_writer is None or self._dashboard_log_writer.done():
+            self._dashboard_log_writer = asyncio.create_task(
+                self._dashboard_log_writer_loop())
+
+    @staticmethod
+    async def _collect_batch(queue: asyncio.Queue, max_items: int,
+                             window: float) -> list:
+        """Wait for one queued item, then take whatever else arrives within window"""
+        loop = asyncio.get_running_loop()
+        batch = [await queue.get()]
+        deadline = loop.time() + window
+        while len(batch) < max_items:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _dashboard_log_writer_loop(self):
+        """Drain queued dashboard rows and append them to Sheets in batches"""
+        while True:
+            batch = await self._collect_batch(
+                self._dashboard_log_queue, DASHBOARD_LOG_BATCH_MAX,
+                DASHBOARD_LOG_BATCH_WINDOW)
+
+            try:
+                await asyncio.to_thread(
+                    self.google_integration.append_dashboard_rows, batch)
+            except Exception as e:
+                logger.warning(f"Failed to write {len(batch)} dashboard log rows: {e}")
+            finally:
+                for _ in batch:
+                    self._dashboard_log_queue.task_done()
+
+    @staticmethod
+    async def _stop_writer(queue: asyncio.Queue, writer: Optional[asyncio.Task],
+                           timeout: float, what: str) -> None:
+        """Wait up to timeout for a background writer to drain queue, then cancel it"""
+        if writer is None or writer.done():
+            return
+        try:
+            await asyncio.wait_for(queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Timed out flushing %s, %d not written", what, queue.qsize())
+        writer.cancel()
+        try:
+            await writer
+        except asyncio.CancelledError:
+            pass
+
+    async def flush_dashboard_logs(self) -> None:
+        """Wait for queued dashboard rows to be written, then stop the writer"""
+        await self._stop_writer(
+            self._dashboard_log_queue, self._dashboard_log_writer,
+            DASHBOARD_LOG_FLUSH_TIMEOUT, "dashboard log rows")
+
+    def _fire_and_forget(self, coro, description: str) -> None:
+        """Run coro as a task off the reply path; failures are only logged"""
+        async def runner():
+            try:
+                await coro
+            except Exception as e:
+                logger.debug(f"Background {description} failed: {e}")
+
+        # Hold a reference until done so the task is not garbage collected
+        task = asyncio.create_task(runner())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _cached_geocode(self, address: str) -> Optional[List[float]]:
+        """Geocode through a TTL cache shared by all sessions and persisted to Sheets"""
+        if not address or not address.strip():
+            return None
+        key = _norm_address(address)
+
+        if not self._geocode_cache_loaded:
+            self._geocode_cache_loaded = True
+            persisted = await asyncio.to_thread(
+                self.google_integration.load_geocode_cache,
+                GEOCODE_CACHE_TTL_SECONDS, GEOCODE_CACHE_MAX_ENTRIES)
+            now_wall, now_mono = datetime.now(), time.monotonic()
+            for cached_key, (coords, cached_at) in persisted.items():
+                # Carry each row's real age over to the monotonic clock
+                age = (now_wall - cached_at).total_seconds()
+                if age < GEOCODE_CACHE_TTL_SECONDS:
+                    self._geocode_cache[cached_key] = (coords, now_mono - age)
+
+        cached = self._geocode_cache.get(key)
+        if cached is not None:
+            coords, cached_at = cached
+            if time.monotonic() - cached_at < GEOCODE_CACHE_TTL_SECONDS:
+                return coords
+            del self._geocode_cache[key]
+
+        # tms geocode may sleep for rate limiting, keep it off the event loop
+        coords = await asyncio.to_thread(self.tms_integration.geocode, address)
+        if coords:
+            # Entries are kept oldest first, so expired entries and any past
+            # GEOCODE_CACHE_MAX_ENTRIES are evicted from the front
+            cache = self._geocode_cache
+            now = time.monotonic()
+            while cache and (
+                    len(cache) >= GEOCODE_CACHE_MAX_ENTRIES
+                    or now - next(iter(cache.values()))[1] >= GEOCODE_CACHE_TTL_SECONDS):
+                del cache[next(iter(cache))]
+            cache[key] = (coords, now)
+            self._fire_and_forget(
+                asyncio.to_thread(
+                    self.google_integration.save_geocode_cache_row, key, coords),
+                "geocode cache write")
+        return coords
+
+    def _log_command_in_background(
+            self,
+            user_id: int,
+            chat_id: int,
+            command: str,
+            success: bool = True,
+            error_message: Optional[str] = None,
+            duration_ms: int = 0,
+            extra_info: Optional[str] = None) -> None:
+        """Non-blocking log_command_execution: queue the row for the background writer"""
+        self._enqueue_dashboard_row(
+            "COMMAND_EXECUTION", user_id, chat_id, command, success=success,
+            error_message=error_message, duration_ms=duration_ms,
+            session_data=extra_info)
+
+    def _log_interaction_in_background(
+            self,
+            user_id: int,
+            chat_id: int,
+            interaction_type: str,
+            details: Optional[str] = None,
+            success: bool = True) -> None:
+        """Non-blocking log_user_interaction: queue the row for the background writer"""
+        self._enqueue_dashboard_row(
+            "USER_INTERACTION", user_id, chat_id, interaction_type,
+            success=success, session_data=details)
+
     def __post_init__(self):
         """Initialize attributes after main __init__"""
         # Acknowledgment system for risk alerts
@@ -215,6 +612,42 @@ class EnhancedLocationBot(RiskDetectionMixin):
         # Job queue reference (set by main application)
         self.job_queue = None
 
+        # Dashboard log rows wait here for _dashboard_log_writer_loop
+        self._dashboard_log_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=DASHBOARD_LOG_QUEUE_MAX)
+        self._dashboard_log_writer: Optional[asyncio.Task] = None
+
+        # (group_id, title, vin) registrations + result futures for
+        # _group_vin_writer_loop
+        self._group_vin_queue: asyncio.Queue = asyncio.Queue()
+        self._group_vin_writer: Optional[asyncio.Task] = None
+
+        # Normalized address -> ([lng, lat], time.monotonic() when cached),
+        # oldest first; seeded from the geocode_cache worksheet on first use
+        self._geocode_cache: Dict[str, tuple] = {}
+        self._geocode_cache_loaded = False
+
+        # Fire-and-forget tasks started by _fire_and_forget
+        self._background_tasks: set = set()
+
+        # "@botname" cache, rebuilt whenever bot_instance is replaced
+        self._bot_mention = None
+        self._bot_mention_source = None
+
+        # Conversation state -> text input handler (see handle_text_message)
+        self._state_handlers = {
+            ASK_DRIVER_NAME: self._process_driver_name,
+            ASK_VIN: self._process_vin,
+            ASK_STOP_LOCATION: self._process_stop_location,
+            ASK_APPOINTMENT: self._process_appointment,
+        }
+
+        # Bot instance reference (will be set when application is built)
+        self.bot_instance = None
+
+        # Risk monitoring settings (switched off below if init fails)
+        self.enable_risk_monitoring = self.config.ENABLE_RISK_MONITORING
+
         # Initialize risk detection (from RiskDetectionMixin)
         if RISK_DETECTION_AVAILABLE:
             try:
@@ -230,6 +663,28 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 "Risk detection not available - continuing without cargo theft monitoring")
             self.enable_risk_monitoring = False
 
+        # Initialize ETA service
+        if ETA_SERVICE_AVAILABLE:
+            try:
+                from eta_service import ETAService
+                google_maps_key = getattr(self.config, 'GOOGLE_MAPS_API_KEY', None)
+                self.eta_service = ETAService(self.config.ORS_API_KEY, google_maps_key)
+                logger.info("ETA service initialized successfully with Google Maps fallback")
+            except Exception as e:
+                logger.error(f"Failed to initialize ETA service: {e}")
+                self.eta_service = None
+        else:
+            logger.warning(
+                "ETA service not available - continuing without ETA alerting")
+            self.eta_service = None
+
+        # Capabilities are fixed after init; checked once here instead of
+        # hasattr probes at each use
+        self.has_risk_detector = RISK_DETECTION_AVAILABLE and hasattr(
+            self, 'risk_detector')
+        self.has_risk_monitoring = RISK_DETECTION_AVAILABLE and bool(
+            self.enable_risk_monitoring)
+
     def _escape_markdown(self, text: str) -> str:
         """Escape special Markdown characters to prevent parsing errors"""
         if not text:
@@ -454,26 +909,14 @@ class EnhancedLocationBot(RiskDetectionMixin):
             logger.warning(
                 "Groups may need manual attention - check GroupUpdateScheduler logs")
 
-        # Bot instance reference (will be set when application is built)
-        self.bot_instance = None
-
-        # Risk monitoring settings
-        self.enable_risk_monitoring = self.config.ENABLE_RISK_MONITORING
-
-        # Initialize ETA service
-        if ETA_SERVICE_AVAILABLE:
-            try:
-                from eta_service import ETAService
-                google_maps_key = getattr(self.config, 'GOOGLE_MAPS_API_KEY', None)
-                self.eta_service = ETAService(self.config.ORS_API_KEY, google_maps_key)
-                logger.info("ETA service initialized successfully with Google Maps fallback")
-            except Exception as e:
-                logger.error(f"Failed to initialize ETA service: {e}")
-                self.eta_service = None
-        else:
-            logger.warning(
-                "ETA service not available - continuing without ETA alerting")
-            self.eta_service = None
+    @property
+    def bot_mention(self) -> Optional[str]:
+        """Cached "@username" for the current bot_instance, or None"""
+        bot = self.bot_instance
+        if bot is not self._bot_mention_source:
+            self._bot_mention_source = bot
+            self._bot_mention = f"@{bot.username}" if bot and bot.username else None
+        return self._bot_mention
 
     def get_session(self, chat_id: int) -> SessionData:
         """Get or create session data for chat"""
@@ -516,8 +959,11 @@ class EnhancedLocationBot(RiskDetectionMixin):
 
         return True
 
-    def cleanup_expired_sessions(self):
-        """Remove sessions that have been inactive beyond the timeout"""
+    async def cleanup_expired_sessions(self):
+        """
+        Remove sessions that have been inactive beyond the timeout, yielding
+        to the event loop every SESSION_CLEANUP_CHUNK sessions
+        """
         if not self.session_timeout_hours:
             return
 
@@ -525,19 +971,30 @@ class EnhancedLocationBot(RiskDetectionMixin):
         cutoff_time = datetime.now() - timeout_delta
         expired_chats = []
 
-        for chat_id, session in self.sessions.items():
+        # Snapshot: handlers may add sessions while we yield
+        for i, (chat_id, session) in enumerate(list(self.sessions.items()), 1):
             # Check if session has never had activity or is expired
             if (session.last_activity is None or
                     session.last_activity < cutoff_time):
                 expired_chats.append(chat_id)
-
-        # Clean up expired sessions
-        for chat_id in expired_chats:
-            logger.info(f"Cleaning up expired session for chat {chat_id}")
-            self.clear_session(chat_id)
-
-        if expired_chats:
-            logger.info(f"Cleaned up {len(expired_chats)} expired sessions")
+            if i % SESSION_CLEANUP_CHUNK == 0:
+                await asyncio.sleep(0)
+
+        # Clean up expired sessions, re-checking each one: a session may
+        # have been used (or replaced) while we yielded
+        cleaned = 0
+        for i, chat_id in enumerate(expired_chats, 1):
+            session = self.sessions.get(chat_id)
+            if session is not None and (session.last_activity is None or
+                                        session.last_activity < cutoff_time):
+                logger.info(f"Cleaning up expired session for chat {chat_id}")
+                self.clear_session(chat_id)
+                cleaned += 1
+            if i % SESSION_CLEANUP_CHUNK == 0:
+                await asyncio.sleep(0)
+
+        if cleaned:
+            logger.info(f"Cleaned up {cleaned} expired sessions")
 
     def acknowledge_alert(self, vin: str):
         """Acknowledge alert for a VIN"""
@@ -931,8 +1388,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             current_speed: float) -> str:
         """Get stop status indicator for display"""
         if session.is_stopped and session.stop_start_time:
-            edt_tz = pytz.timezone('America/New_York')
-            current_time_edt = datetime.now(edt_tz)
+            current_time_edt = datetime.now(NY_TZ)
             stop_duration = current_time_edt - session.stop_start_time
 
             hours = int(stop_duration.total_seconds() // 3600)
@@ -989,15 +1445,13 @@ class EnhancedLocationBot(RiskDetectionMixin):
             )
 
             # Get current time in EDT for ETA calculations
-            import pytz
-            edt_tz = pytz.timezone('America/New_York')
-            now_edt = datetime.now(edt_tz)
+            now_edt = datetime.now(NY_TZ)
 
             # Check if we have stop location for route calculation
             if session.stop_address:
                 try:
                     # Calculate route for delivery info
-                    dest_coords = self.tms_integration.geocode(
+                    dest_coords = await self._cached_geocode(
                         session.stop_address)
                     if dest_coords:
                         origin = [session.lng, session.lat]
@@ -1006,7 +1460,6 @@ class EnhancedLocationBot(RiskDetectionMixin):
 
                         if route:
                             # Add delivery information
-                            import html
                             message += f"📦 <b>Delivery Address:</b> {html.escape(session.stop_address)}\n\n"
 
                             # Add route information with EDT timezone
@@ -1030,11 +1483,12 @@ class EnhancedLocationBot(RiskDetectionMixin):
                                     from datetime import datetime as dt
                                     appt_time_naive = dt.strptime(
                                         appt_str, "%I:%M %p")
-                                    appt_time_edt = edt_tz.localize(appt_time_naive.replace(
+                                    appt_time_edt = appt_time_naive.replace(
                                         year=now_edt.year,
                                         month=now_edt.month,
-                                        day=now_edt.day
-                                    ))
+                                        day=now_edt.day,
+                                        tzinfo=NY_TZ
+                                    )
 
                                     if eta_time_edt > appt_time_edt:
                                         status_emoji = "⚠️"
@@ -1158,16 +1612,15 @@ class EnhancedLocationBot(RiskDetectionMixin):
             return "GPS data timestamp unavailable"
 
         try:
-            import pytz
             # Parse the TMS timestamp
             update_dt = datetime.strptime(
                 update_time_str.replace("EST", "").replace("EDT", ""),
                 "%m-%d-%Y %H:%M:%S "
-            ).replace(tzinfo=pytz.timezone("America/New_York"))
+            ).replace(tzinfo=NY_TZ)
 
             # Calculate age in hours
-            now_utc = datetime.now(pytz.utc)
-            update_utc = update_dt.astimezone(pytz.utc)
+            now_utc = datetime.now(timezone.utc)
+            update_utc = update_dt.astimezone(timezone.utc)
             age_hours = (now_utc - update_utc).total_seconds() / 3600
 
             # More aggressive warnings for very old data
@@ -1198,7 +1651,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
         user_id = update.effective_user.id if update.effective_user else 0
 
         # Log command execution
-        self.google_integration.log_command_execution(
+        self._log_command_in_background(
             user_id=user_id,
             chat_id=chat_id,
             command="start",
@@ -1231,8 +1684,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                         )
 
                         # Add risk detection status if available
-                        if RISK_DETECTION_AVAILABLE and hasattr(
-                                self, 'enable_risk_monitoring') and self.enable_risk_monitoring:
+                        if self.has_risk_monitoring:
                             welcome_msg += f"🛡️ Cargo theft monitoring: **ACTIVE**\n"
                             welcome_msg += f"🔕 Alert acknowledgments: {len(self.acknowledged_alerts)} active\n"
 
@@ -1358,25 +1810,62 @@ class EnhancedLocationBot(RiskDetectionMixin):
             logger.error(f"Error getting group VIN for {group_id}: {e}")
             return None
 
-    def _save_group_vin(
-            self,
-            group_id: int,
-            group_title: str,
-            vin: str,
-            driver_name: Optional[str] = None) -> bool:
-        """Save VIN for a group to Google Sheets groups worksheet"""
-        try:
-            success = self.google_integration.save_group_vin(
-                group_id, group_title, vin, driver_name)
-            if success:
-                logger.info(
-                    f"Successfully saved VIN for group {group_id}: {vin}")
-            else:
-                logger.error(f"Failed to save VIN for group {group_id}")
-            return success
-        except Exception as e:
-            logger.error(f"Error saving group VIN for {group_id}: {e}")
-            return False
+    async def _save_group_vin(self, reg: GroupRegistration) -> bool:
+        """
+        Save VIN for a group to Google Sheets groups worksheet. Registrations
+        arriving together are written in one batch by _group_vin_writer_loop;
+        this waits for that batch and returns whether it was saved.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._group_vin_queue.put_nowait(
+            ((reg.chat_id, reg.title, reg.vin), future))
+        if self._group_vin_writer is None or self._group_vin_writer.done():
+            self._group_vin_writer = asyncio.create_task(
+                self._group_vin_writer_loop())
+
+        success = await future
+        if success:
+            logger.info(
+                "Successfully saved VIN for group %s: %s", reg.chat_id, reg.vin)
+        else:
+            logger.error("Failed to save VIN for group %s", reg.chat_id)
+        return success
+
+    async def _group_vin_writer_loop(self):
+        """Drain queued group VIN registrations and upsert them in batches"""
+        while True:
+            batch = await self._collect_batch(
+                self._group_vin_queue, GROUP_VIN_BATCH_MAX,
+                GROUP_VIN_BATCH_WINDOW)
+
+            success = False
+            try:
+                success = await asyncio.to_thread(
+                    self.google_integration.save_group_vins,
+                    [entry for entry, _ in batch])
+            except Exception as e:
+                logger.error("Error saving %d group VINs: %s", len(batch), e)
+            finally:
+                # Also runs when the writer is cancelled mid-batch, so no
+                # caller is left waiting
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(success)
+                    self._group_vin_queue.task_done()
+
+    async def flush_group_vins(self) -> None:
+        """
+        Wait for queued group VIN registrations to be saved, then stop the
+        writer. Registrations still queued after the timeout report failure.
+        """
+        await self._stop_writer(
+            self._group_vin_queue, self._group_vin_writer,
+            GROUP_VIN_FLUSH_TIMEOUT, "group VIN registrations")
+        while not self._group_vin_queue.empty():
+            _, future = self._group_vin_queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
+            self._group_vin_queue.task_done()
 
     async def button_router(
             self,
@@ -1418,7 +1907,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
         callback_data = query.data
 
         # Log button interaction
-        self.google_integration.log_user_interaction(
+        self._log_interaction_in_background(
             user_id=user_id,
             chat_id=chat_id,
             interaction_type="button_click",
@@ -1465,7 +1954,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 logger.info(
                     f"Driver selection button clicked: {callback_data}")
                 await self._handle_driver_selection(update, context)
-            elif callback_data.startswith(("contact_driver_", "ack_alert_", "escalate_alert_")):
+            elif RISK_CB_RE.match(callback_data):
                 if RISK_DETECTION_AVAILABLE:
                     await self.handle_risk_alert_callback(update, context)
                 else:
@@ -1479,13 +1968,14 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     logger.error("VIN suggestion handlers not available")
                     await query.edit_message_text("❌ VIN suggestion system not available", parse_mode='Markdown')
             # DIAGNOSTIC BUTTONS
-            elif callback_data == "run_groups_diagnostic":
+            elif callback_data.partition(":")[0] == CB_RUN_GROUPS_DIAGNOSTIC:
                 # Only allow owner to run diagnostics
                 if update.effective_user.id == self.owner_id:
                     await query.answer("Running groups diagnostic...")
-                    # Create a fake update for the diagnostic command
-                    fake_update = update
-                    await self.groups_diagnostic_command(fake_update, context)
+                    cached_records = self._pop_diag_records(
+                        context, callback_data.partition(":")[2])
+                    await self.groups_diagnostic_command(
+                        update, context, cached_records=cached_records)
                 else:
                     await query.answer("❌ Only the owner can run diagnostics", show_alert=True)
             elif callback_data == "view_sheet_structure":
@@ -1535,17 +2025,14 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await update.callback_query.edit_message_text(
                 "👤 **Enter Driver Name:**\n\nPlease send the driver name to track:",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
         else:
             # Group without VIN
             await update.callback_query.edit_message_text(
                 "⚠️ **VIN Required**\n\nThis group needs VIN registration first.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🛠 Set VIN", callback_data=CB_SET_VIN)],
-                    [InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]
-                ])
+                reply_markup=SET_VIN_BACK_MARKUP
             )
 
     async def _send_manual_location_update(
@@ -1596,7 +2083,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 await update.callback_query.edit_message_text(
                     message,
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
@@ -1617,7 +2104,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await update.callback_query.edit_message_text(
                 f"❌ **Update Failed**\n\n{error_msg}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def _handle_set_vin(
@@ -1631,7 +2118,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await update.callback_query.edit_message_text(
                 "⚠️ **Groups Only**\n\nVIN registration is only available for group chats.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
             return
 
@@ -1665,14 +2152,14 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 "Please send the VIN number for this group's truck.\n\n"
                 "This will enable automatic hourly location updates.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
         except Exception as e:
             logger.error(f"Error in VIN suggestion system: {e}")
             await update.callback_query.edit_message_text(
                 "❌ **Error**\n\nUnable to access VIN suggestion system. Please try again later.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def _handle_send_stop_location(
@@ -1694,7 +2181,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             "• Walmart Distribution Center, Phoenix\n"
             "• 85323 (ZIP code)",
             parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+            reply_markup=BACK_MARKUP
         )
 
     async def _handle_send_appointment(
@@ -1722,7 +2209,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             "• 14:45\n\n"
             "Time will be interpreted as EDT timezone.",
             parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+            reply_markup=BACK_MARKUP
         )
 
     async def _handle_calculate_eta(
@@ -1738,10 +2225,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await update.callback_query.edit_message_text(
                 "⚠️ **VIN Required**\n\nPlease set VIN first for ETA calculation.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🛠 Set VIN", callback_data=CB_SET_VIN)],
-                    [InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]
-                ])
+                reply_markup=SET_VIN_BACK_MARKUP
             )
             return
 
@@ -1797,7 +2281,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 await update.callback_query.edit_message_text(
                     message,
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
@@ -1808,7 +2292,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             session.last_updated = datetime.now()
 
             # Calculate route
-            dest_coords = self.tms_integration.geocode(session.stop_address)
+            dest_coords = await self._cached_geocode(session.stop_address)
             if not dest_coords:
                 await update.callback_query.edit_message_text(
                     f"⚠️ **Geocoding Failed**\n\nCould not find coordinates for: {session.stop_address}",
@@ -1848,7 +2332,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await update.callback_query.edit_message_text(
                 f"❌ **ETA Calculation Failed**\n\n{str(e)}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def _send_eta_summary(
@@ -1859,8 +2343,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             route: dict):
         """Send detailed ETA summary with correct timezone handling"""
         # Use EDT timezone for calculations
-        edt_tz = pytz.timezone('America/New_York')
-        now_edt = datetime.now(edt_tz)
+        now_edt = datetime.now(NY_TZ)
         eta_time_edt = now_edt + route['duration']
 
         # Determine status
@@ -1876,11 +2359,12 @@ class EnhancedLocationBot(RiskDetectionMixin):
 
                 # Parse appointment time and set it to EDT timezone
                 appt_time_naive = dt.strptime(appt_str, "%I:%M %p")
-                appt_time_edt = edt_tz.localize(appt_time_naive.replace(
+                appt_time_edt = appt_time_naive.replace(
                     year=now_edt.year,
                     month=now_edt.month,
-                    day=now_edt.day
-                ))
+                    day=now_edt.day,
+                    tzinfo=NY_TZ
+                )
 
                 if eta_time_edt > appt_time_edt:
                     status_emoji = "⚠️"
@@ -1983,13 +2467,10 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 "• Won't respond to general group messages"
             )
 
-        keyboard = [[InlineKeyboardButton(
-            "🔙 Back", callback_data=CB_BACK_TO_MAIN)]]
-
         await update.callback_query.edit_message_text(
             help_text,
             parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=BACK_MARKUP
         )
 
     async def _handle_admin_contact(
@@ -2009,13 +2490,10 @@ class EnhancedLocationBot(RiskDetectionMixin):
             "• Missing features - Ensure bot has proper permissions"
         )
 
-        keyboard = [[InlineKeyboardButton(
-            "🔙 Back", callback_data=CB_BACK_TO_MAIN)]]
-
         await update.callback_query.edit_message_text(
             contact_text,
             parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            reply_markup=BACK_MARKUP
         )
 
     async def _handle_stop_auto_refresh(
@@ -2046,7 +2524,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 "ℹ️ **No Active Updates**\n\n"
                 "No automatic updates are currently running.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back to Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_TO_MAIN_MARKUP
             )
 
     async def _handle_start_auto_refresh(
@@ -2067,14 +2545,14 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     "Hourly location updates have been restarted.\n\n"
                     "Next update in ~1 hour.",
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back to Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_TO_MAIN_MARKUP
                 )
             else:
                 await update.callback_query.edit_message_text(
                     "⚠️ **Job Queue Unavailable**\n\n"
                     "Cannot start auto-updates (job queue error).",
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back to Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_TO_MAIN_MARKUP
                 )
         else:
             await update.callback_query.edit_message_text(
@@ -2128,19 +2606,19 @@ class EnhancedLocationBot(RiskDetectionMixin):
             )
 
             # Add risk detection reload status if available
-            if RISK_DETECTION_AVAILABLE and hasattr(self, 'risk_detector'):
+            if self.has_risk_detector:
                 reload_msg += "\n✅ Risk detection zones refreshed"
 
             await update.callback_query.edit_message_text(
                 reload_msg,
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back to Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_TO_MAIN_MARKUP
             )
         except Exception as e:
             await update.callback_query.edit_message_text(
                 f"❌ **Reload Failed**\n\n{str(e)}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back to Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_TO_MAIN_MARKUP
             )
 
     async def _handle_status(
@@ -2211,12 +2689,9 @@ class EnhancedLocationBot(RiskDetectionMixin):
             f"• Sample Drivers:\n{sample_text}")
 
         # Add risk detection status if available
-        if RISK_DETECTION_AVAILABLE and hasattr(self, 'risk_detector'):
-            risk_zones = len(
-                self.risk_detector.risk_zones) if hasattr(
-                self.risk_detector,
-                'risk_zones') else 0
-            risk_enabled = getattr(self, 'enable_risk_monitoring', False)
+        if self.has_risk_detector:
+            risk_zones = len(self.risk_detector.risk_zones)
+            risk_enabled = self.enable_risk_monitoring
             status_msg += (
                 f"\n\n🛡️ **Risk Detection:**\n"
                 f"• Risk zones: {risk_zones}\n"
@@ -2237,7 +2712,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
         await update.callback_query.edit_message_text(
             status_msg,
             parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back to Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+            reply_markup=BACK_TO_MAIN_MARKUP
         )
 
     async def _handle_risk_status(
@@ -2245,11 +2720,11 @@ class EnhancedLocationBot(RiskDetectionMixin):
             update: Update,
             context: ContextTypes.DEFAULT_TYPE):
         """Handle risk status display (owner only)"""
-        if not RISK_DETECTION_AVAILABLE or not hasattr(self, 'risk_detector'):
+        if not self.has_risk_detector:
             await update.callback_query.edit_message_text(
                 "⚠️ **Risk Detection Not Available**\n\nRisk detection modules are not installed or configured.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
             return
 
@@ -2297,7 +2772,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 f"• ETA alerting: {'✅ Enabled' if getattr(self.config, 'SEND_QC_LATE_ALERTS', True) else '❌ Disabled'}\n"
                 f"• Grace period: {getattr(self.config, 'ETA_GRACE_MINUTES', 10)} minutes\n\n"
                 f"**Settings:**\n"
-                f"• Monitoring: {'✅ Enabled' if getattr(self, 'enable_risk_monitoring', False) else '❌ Disabled'}\n"
+                f"• Monitoring: {'✅ Enabled' if self.enable_risk_monitoring else '❌ Disabled'}\n"
                 f"• QC Chat: {'✅ Configured' if getattr(self, 'qc_chat_id', None) else '❌ Not set'}\n"
                 f"• MGMT Chat: {'✅ Configured' if getattr(self, 'mgmt_chat_id', None) else '❌ Not set'}\n"
                 f"• Risk check interval: {getattr(self, 'risk_check_interval', 300)//60} minutes\n"
@@ -2319,7 +2794,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await update.callback_query.edit_message_text(
                 f"❌ **Risk Status Error**\n\n{self._escape_markdown(str(e))}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def update_all_groups(
@@ -2327,21 +2802,19 @@ class EnhancedLocationBot(RiskDetectionMixin):
             update: Update,
             context: ContextTypes.DEFAULT_TYPE):
         """Command to manually trigger location updates for all registered groups (owner only)"""
-        user_id = update.effective_user.id if update.effective_user else 0
-        chat_id = update.effective_chat.id
-
-        logger.info(f"updateall command called by user {user_id}, owner is {self.owner_id}")
-
         # Check if user is owner
-        if user_id != self.owner_id:
-            logger.warning(f"updateall command denied for user {user_id} (not owner {self.owner_id})")
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
+            logger.warning(f"updateall command denied for user {eu.id if eu else 0} (not owner {self.owner_id})")
             await update.message.reply_text("❌ This command is only available to the bot owner.")
             return
-        
+
+        user_id = eu.id
+        chat_id = update.effective_chat.id
         logger.info(f"updateall command authorized for owner {user_id}")
 
         # Log command execution
-        self.google_integration.log_command_execution(
+        self._log_command_in_background(
             user_id=user_id,
             chat_id=chat_id,
             command="updateall",
@@ -2364,7 +2837,8 @@ class EnhancedLocationBot(RiskDetectionMixin):
             
             logger.info("Groups worksheet is available, proceeding...")
 
-            groups_records = self.google_integration._get_groups_records_safe()
+            groups_records = await asyncio.to_thread(
+                self.google_integration._get_groups_records_safe)
             logger.info(
                 f"Retrieved {len(groups_records)} total records from groups sheet")
 
@@ -2424,19 +2898,23 @@ class EnhancedLocationBot(RiskDetectionMixin):
 
             if not groups:
                 # Provide more detailed error message with actionable steps
-                error_msg = f"📭 **No active groups found**\n\n"
-                error_msg += f"📊 **Sheet Analysis:**\n"
-                error_msg += f"• Total records: {len(groups_records)}\n"
-                error_msg += f"• Skipped records: {skipped_count}\n\n"
-                error_msg += f"**Troubleshooting steps:**\n"
-                error_msg += f"1. Use `/groupsdiag` for detailed sheet analysis\n"
-                error_msg += f"2. Check that groups have status 'ACTIVE'\n"
-                error_msg += f"3. Verify group_id and vin columns are filled\n"
-                error_msg += f"4. Add groups to the 'groups' sheet manually\n\n"
-                error_msg += f"💡 **Auto-register groups with VIN suggestion system**"
+                error_msg = "".join([
+                    "📭 **No active groups found**\n\n",
+                    "📊 **Sheet Analysis:**\n",
+                    f"• Total records: {len(groups_records)}\n",
+                    f"• Skipped records: {skipped_count}\n\n",
+                    "**Troubleshooting steps:**\n",
+                    "1. Use `/groupsdiag` for detailed sheet analysis\n",
+                    "2. Check that groups have status 'ACTIVE'\n",
+                    "3. Verify group_id and vin columns are filled\n",
+                    "4. Add groups to the 'groups' sheet manually\n\n",
+                    "💡 **Auto-register groups with VIN suggestion system**",
+                ])
 
+                # Let the diagnostic button reuse the records we just read
+                diag_key = self._stash_diag_records(context, groups_records)
                 keyboard = [
-                    [InlineKeyboardButton("🔍 Run Diagnostic", callback_data="run_groups_diagnostic")],
+                    [InlineKeyboardButton("🔍 Run Diagnostic", callback_data=f"{CB_RUN_GROUPS_DIAGNOSTIC}:{diag_key}")],
                     [InlineKeyboardButton("📋 View Sheet Structure", callback_data="view_sheet_structure")]
                 ]
 
@@ -2470,7 +2948,8 @@ class EnhancedLocationBot(RiskDetectionMixin):
 
                 try:
                     # Get truck location from TMS (bypass cache for fresh data)
-                    trucks = self.tms_integration.load_truck_list(use_cache=False)
+                    trucks = await asyncio.to_thread(
+                        self.tms_integration.load_truck_list, use_cache=False)
                     truck = self.tms_integration.find_truck_by_vin(trucks, vin)
 
                     if not truck:
@@ -2480,33 +2959,25 @@ class EnhancedLocationBot(RiskDetectionMixin):
                         continue
 
                     # Format truck info
-                    truck_info = self.tms_integration.format_truck_info(truck)
-
-                    # Build location update message
-                    lat = truck_info.get('latitude', 0)
-                    lng = truck_info.get('longitude', 0)
+                    ti_get = self.tms_integration.format_truck_info(truck).get
 
                     # Get correct driver name from Google Sheets assets data
-                    driver_name = self.google_integration.get_driver_name_by_vin(
+                    driver_name = await asyncio.to_thread(
+                        self.google_integration.get_driver_name_by_vin,
                         vin) or 'Unknown Driver'
 
-                    status = truck_info.get('status', 'Unknown')
-                    location = truck_info.get('location', 'Unknown Location')
-                    speed = truck_info.get('speed_display', '0 mph')
-                    normalized_speed = truck_info.get('speed', 0)
-
-                    # Choose appropriate status emoji based on movement
-                    status_emoji = "🟢" if normalized_speed > 0 else "🔴"
-
-                    message = (
-                        f"🚛 **Manual Location Update**\n\n"
-                        f"👤 **Driver:** {driver_name}\n"
-                        f"🚛 **Unit:** {vin}\n"
-                        f"{status_emoji} **Status:** {status}\n"
-                        f"📍 **Location:** {location}\n"
-                        f"🏃 **Speed:** {speed}\n"
-                        f"📡 **Updated:** {datetime.now(pytz.timezone('America/New_York')).strftime('%H:%M:%S ET')}\n\n"
-                        f"🗺️ [View on Map](https://maps.google.com/?q={lat},{lng})")
+                    # Build location update message
+                    message = MANUAL_LOCATION_UPDATE_TEMPLATE.format_map({
+                        'driver_name': driver_name,
+                        'vin': vin,
+                        'emoji': MOVEMENT_STATUS_EMOJI[ti_get('speed', 0) > 0],
+                        'status': ti_get('status', 'Unknown'),
+                        'location': ti_get('location', 'Unknown Location'),
+                        'speed': ti_get('speed_display', '0 mph'),
+                        'ts': datetime.now(NY_TZ).strftime('%H:%M:%S ET'),
+                        'lat': ti_get('latitude', 0),
+                        'lng': ti_get('longitude', 0),
+                    })
 
                     # Send message to group
                     await context.bot.send_message(
@@ -2537,23 +3008,23 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     logger.error(f"Error updating group {group_id}: {e}")
 
             # Send final status
-            final_msg = (
+            final_parts = [
                 f"✅ **Update All Groups Complete**\n\n"
                 f"📊 **Summary:**\n"
                 f"• Total groups: {len(groups)}\n"
                 f"• Successful updates: {success_count}\n"
                 f"• Failed updates: {error_count}\n"
-            )
+            ]
 
-            if errors and len(errors) <= 10:
-                final_msg += f"\n❌ **Errors:**\n"
-                for error in errors[:10]:
-                    final_msg += f"• {error}\n"
-                if len(errors) > 10:
-                    final_msg += f"• ... and {len(errors) - 10} more errors"
-            elif errors:
-                final_msg += f"\n❌ **{len(errors)} errors occurred** (check logs for details)"
+            n_err = len(errors)
+            shown_errors = errors[:10]
+            if shown_errors:
+                final_parts.append("\n❌ **Errors:**\n")
+                final_parts.extend(f"• {error}\n" for error in shown_errors)
+                if n_err > 10:
+                    final_parts.append(f"• ... and {n_err - 10} more errors (check logs for details)")
 
+            final_msg = "".join(final_parts)
             await status_msg.edit_text(final_msg, parse_mode="Markdown")
 
         except Exception as e:
@@ -2569,16 +3040,17 @@ class EnhancedLocationBot(RiskDetectionMixin):
             update: Update,
             context: ContextTypes.DEFAULT_TYPE):
         """Command to manually update assets worksheet with current TMS data (owner only)"""
-        user_id = update.effective_user.id if update.effective_user else 0
-        chat_id = update.effective_chat.id
-
         # Check if user is owner
-        if user_id != self.owner_id:
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
             await update.message.reply_text("❌ This command is only available to the bot owner.")
             return
 
+        user_id = eu.id
+        chat_id = update.effective_chat.id
+
         # Log command execution
-        self.google_integration.log_command_execution(
+        self._log_command_in_background(
             user_id=user_id,
             chat_id=chat_id,
             command="updateassets",
@@ -2596,7 +3068,8 @@ class EnhancedLocationBot(RiskDetectionMixin):
 
             # Call the Google integration method to update assets (no limit -
             # process all trucks)
-            result = self.google_integration.update_assets_with_current_data()
+            result = await asyncio.to_thread(
+                self.google_integration.update_assets_with_current_data)
 
             if "error" in result:
                 await status_msg.edit_text(
@@ -2608,7 +3081,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 return
 
             # Build success message
-            success_msg = (
+            success_parts = [
                 f"✅ **Assets Update Complete**\n\n"
                 f"📊 **Summary:**\n"
                 f"• Trucks processed: {result.get('trucks_processed', 0)}\n"
@@ -2616,23 +3089,24 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 f"• Field updates made: {result.get('field_updates_made', 0)}\n"
                 f"• New trucks found: {result.get('new_trucks_found', 0)}\n"
                 f"• Errors: {result.get('errors', 0)}\n"
-                f"• Completed at: {result.get('timestamp', 'Unknown')}\n")
+                f"• Completed at: {result.get('timestamp', 'Unknown')}\n"]
 
             # Add error details if any
             error_details = result.get('error_details', [])
             if error_details:
-                success_msg += f"\n⚠️ **Errors encountered:**\n"
+                success_parts.append("\n⚠️ **Errors encountered:**\n")
                 for error in error_details[:5]:  # Show max 5 errors
-                    success_msg += f"• {error}\n"
+                    success_parts.append(f"• {error}\n")
                 if len(error_details) > 5:
-                    success_msg += f"• ... and {len(error_details) - 5} more errors"
+                    success_parts.append(f"• ... and {len(error_details) - 5} more errors")
 
             # Add helpful info
             if result.get('new_trucks_found', 0) > 0:
-                success_msg += (
+                success_parts.append(
                     f"\n💡 **Note:** Found {result.get('new_trucks_found', 0)} trucks in TMS "
                     f"that are not in the assets worksheet. Check logs for VINs.")
 
+            success_msg = "".join(success_parts)
             await status_msg.edit_text(success_msg, parse_mode="Markdown")
 
         except Exception as e:
@@ -2660,16 +3134,17 @@ class EnhancedLocationBot(RiskDetectionMixin):
             update: Update,
             context: ContextTypes.DEFAULT_TYPE):
         """Command to list trucks found in TMS but not in assets worksheet (owner only)"""
-        user_id = update.effective_user.id if update.effective_user else 0
-        chat_id = update.effective_chat.id
-
         # Check if user is owner
-        if user_id != self.owner_id:
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
             await update.message.reply_text("❌ This command is only available to the bot owner.")
             return
 
+        user_id = eu.id
+        chat_id = update.effective_chat.id
+
         # Log command execution
-        self.google_integration.log_command_execution(
+        self._log_command_in_background(
             user_id=user_id,
             chat_id=chat_id,
             command="listnewtrucks",
@@ -2685,8 +3160,12 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 f"⏳ This may take a moment..."
             )
 
-            # Get list of new trucks
-            result = self.google_integration.list_new_trucks_found(limit=20)
+            # Get list of new trucks ("/listnewtrucks refresh" bypasses the
+            # cached TMS/assets snapshot)
+            force_refresh = bool(context.args) and context.args[0].lower() == "refresh"
+            result = await asyncio.to_thread(
+                self.google_integration.list_new_trucks_found,
+                limit=20, force_refresh=force_refresh)
 
             if "error" in result:
                 await status_msg.edit_text(
@@ -2780,14 +3259,15 @@ class EnhancedLocationBot(RiskDetectionMixin):
             update: Update,
             context: ContextTypes.DEFAULT_TYPE):
         """Command to manually add a specific truck by VIN to assets worksheet (owner only)"""
-        user_id = update.effective_user.id if update.effective_user else 0
-        chat_id = update.effective_chat.id
-
         # Check if user is owner
-        if user_id != self.owner_id:
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
             await update.message.reply_text("❌ This command is only available to the bot owner.")
             return
 
+        user_id = eu.id
+        chat_id = update.effective_chat.id
+
         # Check if VIN was provided
         if not context.args or len(context.args) != 1:
             await update.message.reply_text(
@@ -2801,7 +3281,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
         vin = context.args[0].strip()
 
         # Log command execution
-        self.google_integration.log_command_execution(
+        self._log_command_in_background(
             user_id=user_id,
             chat_id=chat_id,
             command="addtruck",
@@ -2819,7 +3299,8 @@ class EnhancedLocationBot(RiskDetectionMixin):
             )
 
             # Add the truck
-            result = self.google_integration.add_new_truck_to_assets(vin)
+            result = await asyncio.to_thread(
+                self.google_integration.add_new_truck_to_assets, vin)
 
             if "error" in result:
                 await status_msg.edit_text(
@@ -2864,89 +3345,137 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     f"Check logs for more details."
                 )
 
+    def _stash_diag_records(
+            self,
+            context: ContextTypes.DEFAULT_TYPE,
+            records: List[Dict[str, Any]]) -> str:
+        """Store groups records in bot_data for the diagnostic button, return the key"""
+        now = time.time()
+        # Drop entries whose button was never pressed
+        for key in [k for k, v in context.bot_data.items()
+                    if isinstance(k, str) and k.startswith("diag:")
+                    and now - v[0] > DIAG_RECORDS_TTL_SECONDS]:
+            del context.bot_data[key]
+
+        diag_key = uuid.uuid4().hex
+        context.bot_data[f"diag:{diag_key}"] = (now, records)
+        return diag_key
+
+    def _pop_diag_records(
+            self,
+            context: ContextTypes.DEFAULT_TYPE,
+            diag_key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return stashed groups records if still fresh, otherwise None"""
+        if not diag_key:
+            return None
+        entry = context.bot_data.pop(f"diag:{diag_key}", None)
+        if entry is None or time.time() - entry[0] > DIAG_RECORDS_TTL_SECONDS:
+            return None
+        return entry[1]
+
     async def groups_diagnostic_command(
             self,
             update: Update,
-            context: ContextTypes.DEFAULT_TYPE):
-        """Diagnostic command to check groups sheet status"""
-        if update.effective_user.id != self.owner_id:
-            await update.message.reply_text("❌ This command is only available to the owner.")
+            context: ContextTypes.DEFAULT_TYPE,
+            cached_records: Optional[List[Dict[str, Any]]] = None):
+        """Diagnostic command to check groups sheet status
+
+        cached_records: groups records already read by the caller (e.g. the
+        /updateall "Run Diagnostic" button); skips the Sheets read when non-empty.
+        """
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
+            await update.effective_message.reply_text("❌ This command is only available to the owner.")
             return
 
         try:
-            msg = "🔍 **Groups Sheet Diagnostic**\n\n"
+            parts = ["🔍 **Groups Sheet Diagnostic**\n\n"]
 
             # Check worksheet initialization
             if not self.google_integration.groups_worksheet:
-                msg += "❌ **Groups worksheet not initialized**\n"
-                msg += "Check Google Sheets connection and worksheet name.\n"
+                parts.append("❌ **Groups worksheet not initialized**\n")
+                parts.append("Check Google Sheets connection and worksheet name.\n")
             else:
-                msg += "✅ **Groups worksheet connected**\n\n"
+                parts.append("✅ **Groups worksheet connected**\n\n")
 
                 # Get worksheet info
                 try:
                     worksheet = self.google_integration.groups_worksheet
-                    msg += f"📋 **Worksheet Info:**\n"
-                    msg += f"• Title: {worksheet.title}\n"
-                    msg += f"• ID: {worksheet.id}\n"
-                    msg += f"• Row count: {worksheet.row_count}\n"
-                    msg += f"• Col count: {worksheet.col_count}\n\n"
+                    parts.append(f"📋 **Worksheet Info:**\n")
+                    parts.append(f"• Title: {worksheet.title}\n")
+                    parts.append(f"• ID: {worksheet.id}\n")
+                    parts.append(f"• Row count: {worksheet.row_count}\n")
+                    parts.append(f"• Col count: {worksheet.col_count}\n\n")
+
+                    # Headers and records come from one values read, or
+                    # from records the caller already fetched (an empty
+                    # list carries no headers, so read the sheet then)
+                    if cached_records:
+                        headers = list(cached_records[0].keys())
+                        records = cached_records
+                    else:
+                        try:
+                            headers, records = await asyncio.to_thread(
+                                self.google_integration.get_groups_sheet_snapshot)
+                        except Exception as e:
+                            parts.append(f"❌ **Error reading sheet values:** {e}\n\n")
+                            headers, records = None, None
 
                     # Get headers
-                    try:
-                        headers = worksheet.row_values(1)
-                        msg += f"📝 **Headers ({len(headers)}):**\n"
+                    if headers is not None:
+                        parts.append(f"📝 **Headers ({len(headers)}):**\n")
                         for i, header in enumerate(
                                 headers[:10]):  # Show first 10
-                            msg += f"• Col {i+1}: '{header}'\n"
+                            parts.append(f"• Col {i+1}: '{header}'\n")
                         if len(headers) > 10:
-                            msg += f"• ... and {len(headers) - 10} more\n"
-                        msg += "\n"
-                    except Exception as e:
-                        msg += f"❌ **Error reading headers:** {e}\n\n"
+                            parts.append(f"• ... and {len(headers) - 10} more\n")
+                        parts.append("\n")
 
                     # Get record count
                     try:
-                        records = self.google_integration._get_groups_records_safe()
-                        msg += f"📊 **Records:** {len(records)} total\n"
+                        if records is None:
+                            records = await asyncio.to_thread(
+                                self.google_integration._get_groups_records_safe)
+                        parts.append(f"📊 **Records:** {len(records)} total\n")
 
                         if records:
                             # Analyze first record
                             sample = records[0]
-                            msg += f"🔍 **Sample record keys:**\n"
+                            parts.append(f"🔍 **Sample record keys:**\n")
                             for key in list(
                                     sample.keys())[:8]:  # Show first 8 keys
-                                msg += f"• '{key}': '{sample.get(key, '')}'\n"
+                                parts.append(f"• '{key}': '{sample.get(key, '')}'\n")
 
-                            # Count by status
-                            status_counts = {}
-                            for record in records:
-                                status_raw = record.get('status', '')
-                                status = (status_raw or '').strip().upper()
-                                status_counts[status] = status_counts.get(
-                                    status, 0) + 1
+                            # Count by status (most frequent first, top 10)
+                            status_counts = Counter(
+                                (record.get('status') or '').strip().upper()
+                                for record in records)
 
-                            msg += f"\n📈 **Status breakdown:**\n"
-                            for status, count in status_counts.items():
-                                msg += f"• '{status}': {count}\n"
+                            parts.append(f"\n📈 **Status breakdown:**\n")
+                            for status, count in status_counts.most_common(10):
+                                parts.append(f"• '{status}': {count}\n")
+                            if len(status_counts) > 10:
+                                parts.append(f"• ... and {len(status_counts) - 10} more\n")
 
                     except Exception as e:
-                        msg += f"❌ **Error reading records:** {e}\n"
+                        parts.append(f"❌ **Error reading records:** {e}\n")
 
                 except Exception as e:
-                    msg += f"❌ **Error accessing worksheet:** {e}\n"
+                    parts.append(f"❌ **Error accessing worksheet:** {e}\n")
 
-            await update.message.reply_text(msg)
+            msg = "".join(parts)
+            await update.effective_message.reply_text(msg)
 
         except Exception as e:
-            await update.message.reply_text(f"❌ **Diagnostic failed:** {str(e)}")
+            await update.effective_message.reply_text(f"❌ **Diagnostic failed:** {str(e)}")
 
     async def validate_data_command(
             self,
             update: Update,
             context: ContextTypes.DEFAULT_TYPE):
         """Validate data integrity between sheets and TMS"""
-        if update.effective_user.id != self.owner_id:
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
             await update.message.reply_text("❌ This command is only available to the owner.")
             return
 
@@ -2957,33 +3486,35 @@ class EnhancedLocationBot(RiskDetectionMixin):
             validation_results = []
 
             try:
-                # Get all assets records
-                assets_records = self.google_integration._get_assets_records_safe()
-
-                # Check for duplicate VINs
-                vin_counts = {}
-                driver_vin_map = {}
-
-                for record in assets_records:
-                    vin_raw = record.get('VIN', '')
-                    vin = (vin_raw or '').strip().upper()
-                    driver_raw = record.get('Driver Name', '')
-                    driver = (driver_raw or '').strip()
-
-                    if vin:
-                        vin_counts[vin] = vin_counts.get(vin, 0) + 1
-                        if vin in driver_vin_map and driver_vin_map[vin] != driver:
-                            validation_results.append(
-                                f"❌ **VIN {vin}** mapped to multiple drivers: '{driver_vin_map[vin]}' and '{driver}'")
-                        else:
-                            driver_vin_map[vin] = driver
-
-                # Find duplicate VINs
-                duplicate_vins = [vin for vin,
-                                  count in vin_counts.items() if count > 1]
-                for vin in duplicate_vins:
-                    validation_results.append(
-                        f"⚠️ **Duplicate VIN:** {vin} appears {vin_counts[vin]} times")
+                # Get all assets records as a cached VIN/driver index
+                assets_index = await asyncio.to_thread(
+                    self.google_integration.get_assets_vin_index)
+                assets_records = assets_index['records']
+                vin_counts = assets_index['vin_counts']
+                driver_vin_map = assets_index['vin_to_driver']
+
+                # Single pass: VINs seen more than once, and for those the
+                # drivers that disagree with the first row. Dicts keep
+                # first-appearance order for the report.
+                seen = {}
+                dupes = {}
+                conflicts = {}
+                for vin, driver in zip(assets_index['vins'], assets_index['drivers']):
+                    first = seen.get(vin)
+                    if first is None:
+                        seen[vin] = driver
+                        continue
+                    dupes[vin] = None
+                    if driver != first:
+                        conflicts.setdefault(vin, set()).add(driver)
+
+                validation_results.extend(
+                    f"❌ **VIN {vin}** mapped to multiple drivers: '{driver_vin_map[vin]}' and "
+                    + ", ".join(f"'{d}'" for d in sorted(others))
+                    for vin, others in conflicts.items())
+                validation_results.extend(
+                    f"⚠️ **Duplicate VIN:** {vin} appears {vin_counts[vin]} times"
+                    for vin in dupes)
 
                 # Check specific case mentioned by user
                 test_vin = "1FUJHHDR4LLLN2336"
@@ -2997,7 +3528,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     f"📊 **Assets Sheet:**\n"
                     f"• Total records: {len(assets_records)}\n"
                     f"• Unique VINs: {len(vin_counts)}\n"
-                    f"• Duplicate VINs: {len(duplicate_vins)}\n\n"
+                    f"• Duplicate VINs: {len(dupes)}\n\n"
                     f"🔧 **Issues Found:**\n" +
                     ("\n".join(validation_results) if validation_results else "✅ No major issues detected")
                 )
@@ -3013,14 +3544,15 @@ class EnhancedLocationBot(RiskDetectionMixin):
             update: Update,
             context: ContextTypes.DEFAULT_TYPE):
         """Handle /workshealth command to check worksheet update status"""
-        user_id = update.effective_user.id if update.effective_user else 0
-        chat_id = update.effective_chat.id
-
         # Check if user is owner
-        if user_id != self.owner_id:
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
             await update.message.reply_text("❌ This command is only available to the bot owner.")
             return
 
+        user_id = eu.id
+        chat_id = update.effective_chat.id
+
         try:
             # Import worksheet monitor
             from worksheet_monitor import create_worksheet_monitor
@@ -3049,7 +3581,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             )
 
             # Log the action
-            self.google_integration.log_command_execution(
+            self._log_command_in_background(
                 user_id=user_id,
                 chat_id=chat_id,
                 command="workshealth",
@@ -3062,7 +3594,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await update.message.reply_text(f"❌ Error checking worksheet health: {str(e)}")
 
             # Log the error
-            self.google_integration.log_command_execution(
+            self._log_command_in_background(
                 user_id=user_id,
                 chat_id=chat_id,
                 command="workshealth",
@@ -3073,16 +3605,17 @@ class EnhancedLocationBot(RiskDetectionMixin):
     async def auto_register_groups_command(
             self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Command to automatically register groups by parsing driver names from titles (owner only)"""
-        user_id = update.effective_user.id if update.effective_user else 0
-        chat_id = update.effective_chat.id
-
         # Check if user is owner
-        if user_id != self.owner_id:
+        eu = update.effective_user
+        if eu is None or eu.id != self.owner_id:
             await update.message.reply_text("❌ This command is only available to the bot owner.")
             return
 
+        user_id = eu.id
+        chat_id = update.effective_chat.id
+
         # Log command execution
-        self.google_integration.log_command_execution(
+        self._log_command_in_background(
             user_id=user_id,
             chat_id=chat_id,
             command="autoregister",
@@ -3141,40 +3674,42 @@ class EnhancedLocationBot(RiskDetectionMixin):
             results = await matcher.batch_auto_register_groups(groups_data)
 
             # Build results message
-            success_msg = (
+            parts = [
                 f"✅ **Auto-Registration Complete**\n\n"
                 f"📊 **Summary:**\n"
                 f"• Total groups processed: {results['total_groups']}\n"
                 f"• Successfully registered: {results['successful']}\n"
                 f"• Failed registrations: {results['failed']}\n"
-                f"• Success rate: {(results['successful'] / results['total_groups'] * 100):.1f}%\n\n")
+                f"• Success rate: {(results['successful'] / results['total_groups'] * 100):.1f}%\n\n"]
 
             # Show successful registrations
-            if results['successes']:
-                success_msg += f"✅ **Successfully Registered:**\n"
-                for success in results['successes'][:10]:  # Show first 10
-                    success_msg += f"• {success['driver_name']} → {success['vin']} ({success['confidence']})\n"
-                if len(results['successes']) > 10:
-                    success_msg += f"• ... and {len(results['successes']) - 10} more\n"
-                success_msg += "\n"
+            successes = results['successes']
+            if successes:
+                parts.append("✅ **Successfully Registered:**\n")
+                parts.extend(  # Show first 10
+                    f"• {success['driver_name']} → {success['vin']} ({success['confidence']})\n"
+                    for success in successes[:10])
+                if len(successes) > 10:
+                    parts.append(f"• ... and {len(successes) - 10} more\n")
+                parts.append("\n")
 
             # Show errors
-            if results['errors']:
-                success_msg += f"❌ **Errors:**\n"
-                for error in results['errors'][:5]:  # Show first 5 errors
-                    success_msg += f"• {error}\n"
-                if len(results['errors']) > 5:
-                    success_msg += f"• ... and {len(results['errors']) - 5} more errors\n"
-                success_msg += "\n"
+            errors = results['errors']
+            if errors:
+                parts.append("❌ **Errors:**\n")
+                parts.extend(f"• {error}\n" for error in errors[:5])  # Show first 5 errors
+                if len(errors) > 5:
+                    parts.append(f"• ... and {len(errors) - 5} more errors\n")
+                parts.append("\n")
 
             # Add helpful tips
-            success_msg += (
+            parts.append(
                 f"💡 **Tips:**\n"
                 f"• Use `/autoregister` to run this again after adding new groups\n"
                 f"• Check group titles follow the format: 'ID - Code - Driver Name - (Code) - Truck_XXX'\n"
                 f"• Manual registration still available with `/addtruck`\n")
 
-            await status_msg.edit_text(success_msg, parse_mode="Markdown")
+            await status_msg.edit_text("".join(parts), parse_mode="Markdown")
 
         except Exception as e:
             logger.error(f"Error in auto_register_groups_command: {e}")
@@ -3210,27 +3745,29 @@ class EnhancedLocationBot(RiskDetectionMixin):
         user_input = update.message.text.strip()
 
         # Log user message interaction
-        self.google_integration.log_user_interaction(
+        self._log_interaction_in_background(
             user_id=user_id,
             chat_id=chat_id,
             interaction_type="text_message",
             details=f"State: {session.current_state}, Input: {user_input[:50]}{'...' if len(user_input) > 50 else ''}"
         )
 
-        # Remove bot mention from input if present
-        if self.bot_instance and self.bot_instance.username:
-            bot_mention = f"@{self.bot_instance.username}"
-            if bot_mention in user_input:
+        # Remove bot mention from input if present. Most messages contain no
+        # '@' at all, so probe for that single char before any mention scan.
+        # Mentions are almost always a prefix or suffix; only fall back to a
+        # full scan/replace when they are not
+        bot_mention = self.bot_mention
+        if bot_mention and '@' in user_input:
+            if user_input.startswith(bot_mention):
+                user_input = user_input.removeprefix(bot_mention).strip()
+            elif user_input.endswith(bot_mention):
+                user_input = user_input.removesuffix(bot_mention).strip()
+            elif bot_mention in user_input:
                 user_input = user_input.replace(bot_mention, "").strip()
 
-        if session.current_state == ASK_DRIVER_NAME:
-            await self._process_driver_name(update, context, user_input)
-        elif session.current_state == ASK_VIN:
-            await self._process_vin(update, context, user_input)
-        elif session.current_state == ASK_STOP_LOCATION:
-            await self._process_stop_location(update, context, user_input)
-        elif session.current_state == ASK_APPOINTMENT:
-            await self._process_appointment(update, context, user_input)
+        state_handler = self._state_handlers.get(session.current_state)
+        if state_handler is not None:
+            await state_handler(update, context, user_input)
         else:
             # No active conversation state - only respond in groups if
             # mentioned or replied to
@@ -3238,13 +3775,15 @@ class EnhancedLocationBot(RiskDetectionMixin):
                 response_text = "ℹ️ Use the menu buttons to interact with the bot."
                 await update.message.reply_text(
                     response_text,
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=MAIN_MENU_MARKUP
                 )
             elif chat_type in ['group', 'supergroup']:
                 # In groups, only respond if bot was mentioned or message is a
                 # reply to bot
-                bot_mentioned = (self.bot_instance and self.bot_instance.username and
-                                 f"@{self.bot_instance.username}" in update.message.text)
+                text = update.message.text
+                bot_mentioned = bool(bot_mention) and (
+                    text.startswith(bot_mention) or text.endswith(bot_mention)
+                    or ('@' in text and bot_mention in text))
                 is_reply_to_bot = (update.message.reply_to_message and
                                    update.message.reply_to_message.from_user.is_bot)
 
@@ -3252,7 +3791,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     response_text = "ℹ️ Use the menu buttons or mention me to interact."
                     await update.message.reply_text(
                         response_text,
-                        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                        reply_markup=MAIN_MENU_MARKUP
                     )
                 # Otherwise, ignore the message to prevent group spam
 
@@ -3280,11 +3819,13 @@ class EnhancedLocationBot(RiskDetectionMixin):
             # 1. No exact match found, OR
             # 2. Input is very short (likely partial name), OR
             # 3. Input appears to be partial (no spaces and short)
+            stripped = driver_name.strip()
+            n = len(stripped)
             should_show_fuzzy = (
                 not vin or  # No match found
-                len(driver_name.strip()) <= 4 or  # Very short input
+                n <= 4 or  # Very short input
                 # Short single word
-                (len(driver_name.strip()) <= 8 and " " not in driver_name.strip())
+                (n <= 8 and " " not in stripped)
             )
 
             if should_show_fuzzy:
@@ -3300,21 +3841,7 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     # Create inline buttons for suggestions
                     keyboard = []
                     for name in suggestions[:5]:  # Limit to 5 suggestions
-                        # Truncate long names for button display, but be
-                        # smarter about it
-                        if len(name) > 25:
-                            # Try to keep important parts (names before
-                            # slashes)
-                            parts = name.split(' / ')
-                            if len(parts) > 1:
-                                display_name = parts[0][:15] + \
-                                    "..." if len(parts[0]) > 15 else parts[0]
-                                display_name += f" / {parts[-1][:8]}..." if len(
-                                    parts[-1]) > 8 else f" / {parts[-1]}"
-                            else:
-                                display_name = name[:25] + "..."
-                        else:
-                            display_name = name
+                        display_name = _button_label(name)
 
                         callback_data = f"DRIVER_SELECT|{name}"
                         logger.debug(
@@ -3559,14 +4086,14 @@ class EnhancedLocationBot(RiskDetectionMixin):
                     await update.message.reply_text(
                         truck_not_found_message,
                         parse_mode='Markdown',
-                        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                        reply_markup=BACK_MARKUP
                     )
                 elif update.callback_query:
                     await context.bot.send_message(
                         chat_id=update.effective_chat.id,
                         text=truck_not_found_message,
                         parse_mode='Markdown',
-                        reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                        reply_markup=BACK_MARKUP
                     )
                 else:
                     logger.error("Unable to send truck not found message - no message or callback_query")
@@ -3588,12 +4115,11 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await self._send_private_location_update(update, context, session, truck)
 
         except Exception as e:
-            logger.error(f"Error processing driver name: {e}")
+            logger.error("Error processing driver name: %s", e, exc_info=True)
 
             # Handle both message and callback contexts
             error_message = f"❌ **Error:** {self._escape_markdown(str(e))}"
-            error_markup = InlineKeyboardMarkup(
-                [[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+            error_markup = BACK_MARKUP
 
             try:
                 if update.message:
@@ -3606,14 +4132,16 @@ class EnhancedLocationBot(RiskDetectionMixin):
                         reply_markup=error_markup
                     )
             except Exception as send_error:
-                logger.error(f"Failed to send error message: {send_error}")
+                logger.error("Failed to send error message: %s", send_error, exc_info=True)
 
     def _find_vin_by_driver_name(self, driver_name: str) -> Optional[str]:
         """Find VIN by driver name using Google Sheets lookup"""
         try:
             return self.google_integration.find_vin_by_driver_name(driver_name)
         except Exception as e:
-            logger.error(f"Error finding VIN for driver {driver_name}: {e}")
+            logger.error(
+                "Error finding VIN for driver %s: %s", driver_name, e,
+                exc_info=True)
             return None
 
     def _find_similar_driver_names_from_sheets(
@@ -3623,7 +4151,9 @@ class EnhancedLocationBot(RiskDetectionMixin):
             return self.google_integration.find_similar_driver_names(
                 search_name)
         except Exception as e:
-            logger.error(f"Error finding similar names for {search_name}: {e}")
+            logger.error(
+                "Error finding similar names for %s: %s", search_name, e,
+                exc_info=True)
             return []
 
     async def _handle_driver_selection(
@@ -3658,11 +4188,11 @@ class EnhancedLocationBot(RiskDetectionMixin):
             await self._process_driver_name(update, context, driver_name)
 
         except Exception as e:
-            logger.error(f"Error handling driver selection: {e}")
+            logger.error("Error handling driver selection: %s", e, exc_info=True)
             await query.edit_message_text(
                 f"❌ **Error:** {self._escape_markdown(str(e))}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def _send_private_location_update(
@@ -3672,6 +4202,10 @@ class EnhancedLocationBot(RiskDetectionMixin):
             session: SessionData,
             truck: dict):
         """Send location update for private chats"""
+        # Resolved once and reused by the error fallback below
+        sheets_driver = None
+        speed_display = 'Unknown'
+        current_speed = 0
         try:
             map_url = f"https://maps.google.com/?q={session.lat},{session.lng}"
             speed_display = self._format_speed_for_display(
@@ -3679,7 +4213,8 @@ class EnhancedLocationBot(RiskDetectionMixin):
             current_speed = self._normalize_speed(truck.get('speed', 0))
 
             # Get correct driver name from Google Sheets assets data
-            sheets_driver = self.google_integration.get_driver_name_by_vin(
+            sheets_driver = await asyncio.to_thread(
+                self.google_integration.get_driver_name_by_vin,
                 session.vin) or session.driver_name or 'Unknown'
             
             # Ensure sheets_driver is never None
@@ -3702,38 +4237,25 @@ class EnhancedLocationBot(RiskDetectionMixin):
             status_emoji = "🟢" if current_speed > 0 else "🔴"
 
             # Use NY timezone for updated time
-            edt_tz = pytz.timezone('America/New_York')
-            updated_time_edt = session.last_updated.replace(tzinfo=pytz.utc).astimezone(
-                edt_tz) if session.last_updated else datetime.now(edt_tz)
-
-            message = (
-                f"📍 **Driver Location**\n\n"
-                f"👤 **Driver:** {display_driver}\n"
-                f"🚛 **Unit:** {session.vin}\n"
-                f"**Speed:** {speed_display}\n"
-                f"{status_emoji} **Status:** {truck.get('status', 'Unknown').title()}\n"
-                f"📍 **Location:** {truck.get('address', 'Unknown')}\n"
-                f"📡 **Updated:** {updated_time_edt.strftime('%I:%M %p')} ET\n")
+            updated_time_edt = _ny_display_time(session.last_updated)
 
             # Add data freshness warning if TMS data is stale
             data_age_warning = self._get_data_age_warning(truck)
-            if data_age_warning:
-                message += f"⚠️ {data_age_warning}\n"
 
-            message += f"\n🗺️ [View on Map]({map_url})"
-
-            keyboard = [
-                [
-                    InlineKeyboardButton(
-                        "📍 Set Stop Location", callback_data=CB_SEND_STOP), InlineKeyboardButton(
-                        "⏰ Set Appointment", callback_data=CB_SEND_APPOINTMENT)], [
-                    InlineKeyboardButton(
-                        "↪️ Calculate ETA", callback_data=CB_CALCULATE_ETA)], [
-                            InlineKeyboardButton(
-                                "🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]]
+            message = PRIVATE_LOCATION_TEMPLATE.format_map({
+                'driver': html.escape(display_driver),
+                'vin': html.escape(str(session.vin)),
+                'speed': html.escape(speed_display),
+                'emoji': status_emoji,
+                'status': html.escape(truck.get('status', 'Unknown').title()),
+                'location': html.escape(truck.get('address') or 'Unknown'),
+                'updated': updated_time_edt.strftime('%I:%M %p'),
+                'warning': f"⚠️ {html.escape(data_age_warning)}\n" if data_age_warning else "",
+                'map_url': html.escape(map_url),
+            })
 
             logger.debug(
-                f"Sending private location update with {len(keyboard)} button rows")
+                f"Sending private location update with {len(PRIVATE_LOCATION_MARKUP.inline_keyboard)} button rows")
 
             # Determine how to send the message based on update type
             send_method = None
@@ -3756,90 +4278,87 @@ class EnhancedLocationBot(RiskDetectionMixin):
             try:
                 await send_method(
                     message,
-                    parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup(keyboard),
+                    parse_mode='HTML',
+                    reply_markup=PRIVATE_LOCATION_MARKUP,
                     disable_web_page_preview=True
                 )
                 logger.info(
                     "Private location update sent successfully with inline buttons")
 
-                # Clean up any progress message from fuzzy matching selection
-                try:
-                    progress_message = context.user_data.get(
-                        'progress_message') if context.user_data else None
-                    if progress_message:
-                        await context.bot.delete_message(
+                # Clean up any progress message from fuzzy matching
+                # selection without holding up the reply
+                progress_message = context.user_data.pop(
+                    'progress_message', None) if context.user_data else None
+                if progress_message:
+                    self._fire_and_forget(
+                        context.bot.delete_message(
                             chat_id=progress_message.chat.id,
-                            message_id=progress_message.message_id
-                        )
-                        context.user_data.pop('progress_message', None)
-                        logger.debug(
-                            "Cleaned up progress message after location update")
-                except Exception as cleanup_error:
-                    logger.debug(
-                        f"Could not clean up progress message: {cleanup_error}")
+                            message_id=progress_message.message_id),
+                        "progress message cleanup")
 
             except Exception as button_error:
                 logger.error(
-                    f"Failed to send buttons with location message: {button_error}")
+                    "Failed to send buttons with location message: %s",
+                    button_error, exc_info=True)
                 # Send without buttons as fallback
                 try:
                     await send_method(
-                        message + f"\n\n⚠️ **Buttons failed**: {str(button_error)}",
-                        parse_mode='Markdown',
+                        message + f"\n\n⚠️ <b>Buttons failed</b>: {html.escape(str(button_error))}",
+                        parse_mode='HTML',
                         disable_web_page_preview=True
                     )
                 except Exception as fallback_error:
                     logger.error(
-                        f"Fallback send also failed: {fallback_error}")
+                        "Fallback send also failed: %s", fallback_error,
+                        exc_info=True)
 
         except Exception as e:
-            logger.error(f"Error in _send_private_location_update: {e}")
+            logger.error("Error in _send_private_location_update: %s", e, exc_info=True)
             # Fallback - send without buttons if there's an error
             try:
-                # Get correct driver name from Google Sheets assets data
-                fallback_driver_name = self.google_integration.get_driver_name_by_vin(
-                    session.vin) or session.driver_name or 'Unknown'
+                # Reuse the driver resolved above; if that lookup is what
+                # failed, querying Sheets again would not help
+                fallback_driver_name = sheets_driver or session.driver_name or 'Unknown'
 
                 # Choose appropriate status emoji based on movement
                 fallback_status_emoji = "🟢" if current_speed > 0 else "🔴"
 
                 # Use NY timezone for updated time
-                fallback_updated_time = updated_time_edt.strftime(
-                    '%I:%M %p') if 'updated_time_edt' in locals() else session.last_updated.strftime('%I:%M %p')
-
-                # Generate map URL from coordinates
-                map_url = f"https://maps.google.com/?q={session.lat},{session.lng}"
-
-                fallback_message = (
-                    f"📍 **Driver Location**\n\n"
-                    f"👤 **Driver:** {fallback_driver_name}\n"
-                    f"🚛 **Unit:** {session.vin}\n"
-                    f"**Speed:** {speed_display}\n"
-                    f"{fallback_status_emoji} **Status:** {truck.get('status', 'Unknown').title()}\n"
-                    f"📍 **Location:** {truck.get('address', 'Unknown')}\n"
-                    f"📡 **Updated:** {fallback_updated_time} ET\n\n"
-                    f"🗺️ [View on Map]({map_url})\n\n"
-                    f"⚠️ Inline buttons unavailable due to error: {str(e)}")
-                
+                fallback_updated_time = _ny_display_time(
+                    session.last_updated).strftime('%I:%M %p')
+
+                fallback_message = PRIVATE_LOCATION_FALLBACK_TEMPLATE.format_map({
+                    'driver': html.escape(fallback_driver_name),
+                    'vin': html.escape(str(session.vin)),
+                    'speed': html.escape(speed_display),
+                    'emoji': fallback_status_emoji,
+                    'status': html.escape(str(truck.get('status', 'Unknown')).title()),
+                    'location': html.escape(str(truck.get('address') or 'Unknown')),
+                    'updated': fallback_updated_time,
+                    'warning': "",
+                    'map_url': html.escape(
+                        f"https://maps.google.com/?q={session.lat},{session.lng}"),
+                    'error': html.escape(str(e)),
+                })
+
                 # Handle both message and callback query contexts
                 if update.message:
                     await update.message.reply_text(
                         fallback_message,
-                        parse_mode='Markdown',
+                        parse_mode='HTML',
                         disable_web_page_preview=True
                     )
                 elif update.callback_query:
                     await context.bot.send_message(
                         chat_id=update.effective_chat.id,
                         text=fallback_message,
-                        parse_mode='Markdown',
+                        parse_mode='HTML',
                         disable_web_page_preview=True
                     )
                 else:
                     logger.error("Unable to send fallback location message - no message or callback_query")
             except Exception as fallback_error:
-                logger.error(f"Fallback message also failed: {fallback_error}")
+                logger.error("Fallback message also failed: %s", fallback_error, exc_info=True)
 
     async def _process_vin(
             self,
@@ -3847,82 +4366,87 @@ class EnhancedLocationBot(RiskDetectionMixin):
             context: ContextTypes.DEFAULT_TYPE,
             vin: str):
         """Process VIN input for group registration"""
-        chat_id = update.effective_chat.id
-        chat_type = update.effective_chat.type
+        msg = update.message
+        chat = update.effective_chat
+        chat_id = chat.id
+        chat_type = chat.type
         session = self.get_session(chat_id)
 
+        # Reject malformed input before touching TMS or Sheets
+        vin = vin.strip().upper()
+        if not VIN_RE.match(vin):
+            await msg.reply_text(
+                INVALID_VIN_TEXT,
+                parse_mode='Markdown',
+                reply_markup=BACK_MARKUP
+            )
+            return
+
         try:
-            # Validate VIN exists in TMS
-            trucks = self.tms_integration.load_truck_list()
+            # Validate VIN exists in TMS. A recently fetched truck list is
+            # reused, which also keeps find_truck_by_vin's VIN index warm
+            trucks = await asyncio.to_thread(
+                self.tms_integration.load_truck_list, use_cache=True)
             truck = self.tms_integration.find_truck_by_vin(trucks, vin)
 
             if not truck:
-                await update.message.reply_text(
-                    f"⚠️ **VIN Not Found**\n\nVIN {vin} not found in TMS data.\n\nPlease check the VIN and try again.",
+                await msg.reply_text(
+                    VIN_NOT_FOUND_TEMPLATE.format(vin=vin),
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
             # Save VIN to Google Sheets
-            group_title = update.effective_chat.title or f"Group {chat_id}"
-            driver_name = truck.get('name')
+            reg = GroupRegistration(
+                chat_id=chat_id,
+                title=chat.title or f"Group {chat_id}",
+                vin=vin,
+                driver_name=truck.get('name'))
 
-            success = self._save_group_vin(
-                chat_id, group_title, vin, driver_name)
+            success = await self._save_group_vin(reg)
 
             if not success:
-                await update.message.reply_text(
-                    "❌ **Registration Failed**\n\nCould not save VIN to database. Please try again.",
+                await msg.reply_text(
+                    REGISTRATION_FAILED_TEXT,
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
             # Update session
-            session.vin = vin
-            session.driver_name = driver_name
-            session.is_group_registered = True
+            session.update_from(reg)
             session.current_state = None
 
             # Start automatic location updates
-            if context.job_queue:
+            auto_updates = bool(context.job_queue)
+            if auto_updates:
                 self._schedule_group_location_updates(chat_id, context)
-                success_msg = (
-                    f"✅ **VIN Set & Auto-Updates Started**\n\n"
-                    f"🚛 **VIN:** {vin}\n"
-                    f"👤 **Driver:** {driver_name}\n"
-                    f"📍 **Hourly location updates:** ACTIVE\n"
-                    f"🔄 **Next update:** ~1 hour\n"
-                )
-
-                # Add risk monitoring status if available
-                if RISK_DETECTION_AVAILABLE and hasattr(
-                        self, 'enable_risk_monitoring') and self.enable_risk_monitoring:
-                    success_msg += f"🛡️ **Cargo theft monitoring:** ACTIVE\n"
-
-                success_msg += f"\n💡 Use buttons in location updates for ETA tracking!"
-            else:
-                success_msg = (
-                    f"✅ **VIN Set Successfully**\n\n"
-                    f"🚛 **VIN:** {vin}\n"
-                    f"👤 **Driver:** {driver_name}\n"
-                    f"⚠️ **Auto-updates unavailable** (job queue error)\n\n"
-                    f"Use manual buttons for updates."
-                )
-
-            await update.message.reply_text(
+            success_msg = VIN_SUCCESS_TEMPLATE.format_map({
+                'vin': vin,
+                'driver': reg.driver_name,
+                **(VIN_SUCCESS_AUTO_PARTS if auto_updates
+                   else VIN_SUCCESS_MANUAL_PARTS),
+                'risk_block': (VIN_SUCCESS_RISK_LINE
+                               if auto_updates and self.has_risk_monitoring
+                               else ""),
+            })
+
+            await msg.reply_text(
                 success_msg,
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=MAIN_MENU_MARKUP
             )
 
         except Exception as e:
-            logger.error(f"Error processing VIN: {e}")
-            await update.message.reply_text(
-                f"❌ **Error:** {self._escape_markdown(str(e))}",
+            logger.error("Error processing VIN: %s", e, exc_info=True)
+            if isinstance(e, BadRequest):
+                # Telegram rejected a reply; sending another would just fail again
+                return
+            await msg.reply_text(
+                f"❌ **Error:** {self._escape_markdown(_short_err(e))}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def _process_stop_location(
@@ -3931,17 +4455,19 @@ class EnhancedLocationBot(RiskDetectionMixin):
             context: ContextTypes.DEFAULT_TYPE,
             location: str):
         """Process stop location input"""
-        chat_id = update.effective_chat.id
+        msg = update.message
+        chat = update.effective_chat
+        chat_id = chat.id
         session = self.get_session(chat_id)
 
         try:
             # Test geocoding
-            coords = self.tms_integration.geocode(location)
+            coords = await self._cached_geocode(location)
             if not coords:
-                await update.message.reply_text(
+                await msg.reply_text(
                     f"⚠️ **Location Not Found**\n\nCould not find coordinates for: {location}\n\nPlease try a more specific address.",
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
@@ -3949,21 +4475,21 @@ class EnhancedLocationBot(RiskDetectionMixin):
             session.stop_address = location
             session.current_state = None
 
-            await update.message.reply_text(
+            await msg.reply_text(
                 f"✅ **Stop Location Set**\n\n📍 **Address:** {location}\n\n💡 Now you can calculate ETA!",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("↪️ Calculate ETA", callback_data=CB_CALCULATE_ETA)],
-                    [InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]
-                ])
+                reply_markup=ETA_MAIN_MENU_MARKUP
             )
 
         except Exception as e:
-            logger.error(f"Error processing stop location: {e}")
-            await update.message.reply_text(
-                f"❌ **Error:** {self._escape_markdown(str(e))}",
+            logger.error("Error processing stop location: %s", e, exc_info=True)
+            if isinstance(e, BadRequest):
+                # Telegram rejected a reply; sending another would just fail again
+                return
+            await msg.reply_text(
+                f"❌ **Error:** {self._escape_markdown(_short_err(e))}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def _process_appointment(
@@ -3972,70 +4498,38 @@ class EnhancedLocationBot(RiskDetectionMixin):
             context: ContextTypes.DEFAULT_TYPE,
             appointment: str):
         """Process appointment time input"""
-        chat_id = update.effective_chat.id
+        msg = update.message
+        chat = update.effective_chat
+        chat_id = chat.id
         session = self.get_session(chat_id)
 
         try:
-            # Validate time format
-            from datetime import datetime as dt
-            
             # Ensure appointment is not None or empty
             if not appointment or not str(appointment).strip():
-                await update.message.reply_text(
-                    "❌ **Error:** No appointment time provided.",
+                await msg.reply_text(
+                    NO_APPOINTMENT_TEXT,
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
             # Safely convert to string and clean
             appointment_str = str(appointment).strip()
             if not appointment_str:
-                await update.message.reply_text(
-                    "❌ **Error:** Empty appointment time provided.",
+                await msg.reply_text(
+                    EMPTY_APPOINTMENT_TEXT,
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
-            # Try different time and datetime formats
-            time_formats = [
-                # Date-time formats first
-                "%Y-%m-%d %H:%M",      # 2025-09-26 08:00
-                "%Y-%m-%d %I:%M %p",   # 2025-09-26 8:00 AM
-                "%m/%d/%Y %H:%M",      # 09/26/2025 08:00
-                "%m/%d/%Y %I:%M %p",   # 09/26/2025 8:00 AM
-                "%m-%d-%Y %H:%M",      # 09-26-2025 08:00
-                "%m-%d-%Y %I:%M %p",   # 09-26-2025 8:00 AM
-                # Time-only formats
-                "%I:%M %p",            # 2:30 PM
-                "%H:%M",               # 14:45
-                "%I:%M%p"              # 2:30PM
-            ]
-            parsed_time = None
-
-            for fmt in time_formats:
-                try:
-                    parsed_time = dt.strptime(appointment_str.upper(), fmt)
-                    break
-                except (ValueError, AttributeError):
-                    continue
+            parsed_time = _parse_appointment(appointment_str)
 
             if not parsed_time:
-                await update.message.reply_text(
-                    f"⚠️ **Invalid Time Format**\n\n"
-                    f"Could not parse: {appointment}\n\n"
-                    f"**Try these formats:**\n"
-                    f"**Date & Time:**\n"
-                    f"• 2025-09-26 08:00\n"
-                    f"• 2025-09-26 8:00 AM\n"
-                    f"• 09/26/2025 2:30 PM\n"
-                    f"**Time Only:**\n"
-                    f"• 2:30 PM\n"
-                    f"• 08:15 AM\n"
-                    f"• 14:45",
+                await msg.reply_text(
+                    INVALID_TIME_FORMAT_TEMPLATE.format(appointment=appointment),
                     parse_mode='Markdown',
-                    reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                    reply_markup=BACK_MARKUP
                 )
                 return
 
@@ -4059,31 +4553,33 @@ class EnhancedLocationBot(RiskDetectionMixin):
             
             session.current_state = None
 
-            await update.message.reply_text(
+            await msg.reply_text(
                 f"✅ **Appointment Time Set**\n\n⏰ **Time:** {display_time} EDT\n\n💡 Calculate ETA to compare with appointment!",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("↪️ Calculate ETA", callback_data=CB_CALCULATE_ETA)],
-                    [InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]
-                ])
+                reply_markup=ETA_MAIN_MENU_MARKUP
             )
 
         except Exception as e:
-            logger.error(f"Error processing appointment: {e}")
-            await update.message.reply_text(
-                f"❌ **Error:** {self._escape_markdown(str(e))}",
+            logger.error("Error processing appointment: %s", e, exc_info=True)
+            if isinstance(e, BadRequest):
+                # Telegram rejected a reply; sending another would just fail again
+                return
+            await msg.reply_text(
+                f"❌ **Error:** {self._escape_markdown(_short_err(e))}",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Back", callback_data=CB_BACK_TO_MAIN)]])
+                reply_markup=BACK_MARKUP
             )
 
     async def cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel command handler"""
-        chat_id = update.effective_chat.id
+        msg = update.message
+        chat = update.effective_chat
+        chat_id = chat.id
         user_id = update.effective_user.id if update.effective_user else 0
         session = self.get_session(chat_id)
 
         # Log command execution
-        self.google_integration.log_command_execution(
+        self._log_command_in_background(
             user_id=user_id,
             chat_id=chat_id,
             command="cancel",
@@ -4093,10 +4589,10 @@ class EnhancedLocationBot(RiskDetectionMixin):
         # Clear conversation state
         session.current_state = None
 
-        await update.message.reply_text(
-            "🚫 **Operation Cancelled**\n\nReturning to main menu.",
+        await msg.reply_text(
+            CANCELLED_TEXT,
             parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data=CB_BACK_TO_MAIN)]])
+            reply_markup=MAIN_MENU_MARKUP
         )
 
 
@@ -4108,11 +4604,16 @@ def build_application(config: Config) -> Application:
 
         # Build the application with job queue enabled (correct method for
         # v20.8)
-        application = (
-            ApplicationBuilder()
-            .token(config.TELEGRAM_BOT_TOKEN)
-            .build()
-        )
+        builder = ApplicationBuilder().token(config.TELEGRAM_BOT_TOKEN)
+        if RATE_LIMITER_AVAILABLE:
+            builder = builder.rate_limiter(AIORateLimiter(
+                overall_max_rate=TELEGRAM_OVERALL_MAX_RATE,
+                group_max_rate=TELEGRAM_GROUP_MAX_RATE,
+                max_retries=TELEGRAM_RATE_LIMIT_RETRIES))
+        else:
+            logger.warning(
+                "aiolimiter not installed - outbound messages are not rate limited")
+        application = builder.build()
 
         # Verify job queue is available (it should be enabled by default in
         # v20.8)
@@ -4216,14 +4717,7 @@ def build_application(config: Config) -> Application:
                 block=False))
 
         application.add_error_handler(_global_error_handler)
-# Add risk alert callback handlers (NEW) - only if risk detection is available
-        if RISK_DETECTION_AVAILABLE:
-            application.add_handler(
-                CallbackQueryHandler(
-                    enhanced_bot.handle_risk_alert_callback,
-                    pattern="^(contact_driver_|ack_alert_|escalate_alert_|refresh_risk_status|ACK_LATE_DEL:|ACK_LATE_PU:)"))
-            logger.info(
-                "Risk alert callback handlers registered with ETA late acknowledgments")
+        # Risk alert callbacks (RISK_CB_RE) are dispatched by button_router
 
         # Add text message handler for conversation states
         # This handler now includes the logic to ignore messages when
@@ -4233,20 +4727,8 @@ def build_application(config: Config) -> Application:
             enhanced_bot.handle_text_message
         ))
 
-        # Schedule risk monitoring if available and enabled
-        if RISK_DETECTION_AVAILABLE and hasattr(
-                enhanced_bot, 'enable_risk_monitoring'):
-            if enhanced_bot.enable_risk_monitoring:
-                # Schedule risk monitoring to start after application is
-                # running
-                async def start_risk_monitoring():
-                    enhanced_bot.schedule_risk_monitoring(application)
-
-                # Add this to run after the application starts
-                application.add_handler(CallbackQueryHandler(
-                    lambda update, context: start_risk_monitoring(),
-                    pattern="^__start_risk_monitoring__$"  # This won't match any real callback
-                ))
+        # Risk monitoring is started by run_enhanced_bot (main.py) once the
+        # application is built, via enhanced_bot.schedule_risk_monitoring
 
         # Schedule session cleanup if timeout is configured
         if enhanced_bot.session_timeout_hours and enhanced_bot.session_timeout_hours > 0:
@@ -4261,7 +4743,7 @@ def build_application(config: Config) -> Application:
 
             if application.job_queue:
                 async def session_cleanup_job(context):
-                    enhanced_bot.cleanup_expired_sessions()
+                    await enhanced_bot.cleanup_expired_sessions()
 
                 application.job_queue.run_repeating(
                     callback=session_cleanup_job,
@@ -4299,14 +4781,11 @@ def build_application(config: Config) -> Application:
             f"Job queue available: {application.job_queue is not None}")
         logger.info(f"Risk detection available: {RISK_DETECTION_AVAILABLE}")
 
-        if RISK_DETECTION_AVAILABLE and hasattr(enhanced_bot, 'risk_detector'):
-            risk_zones = len(
-                enhanced_bot.risk_detector.risk_zones) if hasattr(
-                enhanced_bot.risk_detector,
-                'risk_zones') else 0
+        if enhanced_bot.has_risk_detector:
+            risk_zones = len(enhanced_bot.risk_detector.risk_zones)
             logger.info(f"Risk zones loaded: {risk_zones}")
             logger.info(
-                f"Risk monitoring enabled: {getattr(enhanced_bot, 'enable_risk_monitoring', False)}")
+                f"Risk monitoring enabled: {enhanced_bot.enable_risk_monitoring}")
             logger.info(
                 f"Acknowledgment system: {len(enhanced_bot.acknowledged_alerts)} active acknowledgments")
 
@@ -7,6 +7,7 @@ import re
 import urllib3
 
 from config import Config
+from data_contracts import VALID_SOURCES
 
 # Disable SSL warnings for OpenRouteService API calls
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -22,7 +23,34 @@ class TMSIntegration:
         self.geocache = {}
         self.zip_cache = config.get_cache_settings().get("zip_cache", {})
 
-    def load_truck_list(self, retry_count: int = 3) -> List[Dict[str, Any]]:
+        # VIN -> truck index for the most recently searched truck list
+        self._vin_index: Dict[str, Dict[str, Any]] = {}
+        self._vin_index_source = None
+
+        # Last successful truck list, reused by load_truck_list(use_cache=True)
+        self._truck_list_cache: Optional[List[Dict[str, Any]]] = None
+        self._truck_list_cache_ts: Optional[datetime] = None
+        self._truck_list_cache_duration = timedelta(seconds=60)
+
+    def load_truck_list(self, retry_count: int = 3,
+                        use_cache: bool = False) -> List[Dict[str, Any]]:
+        """
+        Load truck list from TMS API. With use_cache, a list fetched within the
+        last _truck_list_cache_duration is returned as is; the same list object
+        is reused, so find_truck_by_vin keeps its VIN index across calls.
+        """
+        now = datetime.now()
+        if (use_cache and self._truck_list_cache is not None and
+                now - self._truck_list_cache_ts < self._truck_list_cache_duration):
+            return self._truck_list_cache
+
+        trucks = self._fetch_truck_list(retry_count)
+        if trucks:
+            self._truck_list_cache = trucks
+            self._truck_list_cache_ts = now
+        return trucks
+
+    def _fetch_truck_list(self, retry_count: int = 3) -> List[Dict[str, Any]]:
         """Load truck list from TMS API with speed data and robust error handling"""
         params = {
             "api_key": self.config.TMS_API_KEY,
@@ -109,9 +137,7 @@ class TMSIntegration:
                     speed = truck.get("speed")  # Extract speed from raw data
 
                     # Filter by source - accept all valid sources
-                    valid_sources = ["samsara", "clubeld",
-                                     "ada_eld", "skybitz", "intangles"]
-                    if source.lower() not in valid_sources:
+                    if source.lower() not in VALID_SOURCES:
                         skipped += 1
                         continue
 
@@ -289,14 +315,22 @@ class TMSIntegration:
         else:
             return f"{int(speed)} mph"
 
+    def build_vin_index(
+            self, trucks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Map upper-cased VIN -> truck for a truck list (first occurrence wins)"""
+        vin_index = {}
+        for truck in trucks:
+            vin_index.setdefault((truck.get("vin") or "").upper(), truck)
+        return vin_index
+
     def find_truck_by_vin(
             self, trucks: List[Dict[str, Any]], vin: str) -> Optional[Dict[str, Any]]:
-        """Find truck by VIN in the truck list"""
-        vin_upper = vin.upper()
-        for truck in trucks:
-            if truck.get("vin", "").upper() == vin_upper:
-                return truck
-        return None
+        """Find truck by VIN in the truck list (O(1) after the first lookup per list)"""
+        # Reuse the index while callers keep passing the same list object
+        if trucks is not self._vin_index_source:
+            self._vin_index = self.build_vin_index(trucks)
+            self._vin_index_source = trucks
+        return self._vin_index.get(vin.upper())
 
     def check_vin_status(self, vin: str) -> Dict[str, Any]:
         """Check why a VIN might not be available in filtered truck list"""
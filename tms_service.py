@@ -10,7 +10,7 @@ from typing import List, Optional, Dict, Any
 from zoneinfo import ZoneInfo
 
 import aiohttp
-from data_contracts import FleetPoint
+from data_contracts import FleetPoint, VALID_SOURCES
 from config import Config
 
 
@@ -175,13 +175,7 @@ class TMSService:
 
             # Accept all valid sources from TMS integration
             source = truck_data.get("source", "")
-            valid_sources = [
-                "samsara",
-                "clubeld",
-                "ada_eld",
-                "skybitz",
-                "intangles"]
-            if source.lower() not in valid_sources:
+            if source.lower() not in VALID_SOURCES:
                 return None
 
             # Parse timestamp and ensure UTC with staleness detection
@@ -4,6 +4,8 @@ VIN Suggestion Handlers - Telegram bot handlers for VIN suggestion and confirmat
 """
 
 import logging
+from functools import cache
+from itertools import islice
 from typing import List, Tuple, Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CallbackQueryHandler, CommandHandler
@@ -30,6 +32,13 @@ CONFIDENCE_THRESHOLD = 70
 AUTO_REGISTER_THRESHOLD = 70
 
 
+@cache
+def _config():
+    """Config for the fresh Sheets connections below, loaded from .env/env once"""
+    from config import Config
+    return Config()
+
+
 async def auto_register_vin_on_group_join(
         update: Update,
         context: ContextTypes.DEFAULT_TYPE):
@@ -563,9 +572,7 @@ async def load_assets_data(
         # ALWAYS use fresh GoogleSheetsIntegration to avoid stale cache
         # The bot_data cached worksheet often has stale/partial data
         from google_integration import GoogleSheetsIntegration
-        from config import Config
-        config = Config()
-        google = GoogleSheetsIntegration(config)
+        google = GoogleSheetsIntegration(_config())
 
         if google.assets_worksheet:
             data = google.assets_worksheet.get_all_values()
@@ -678,7 +685,7 @@ async def get_driver_name_for_vin(
             return None
 
         # Search for VIN in assets (column E = index 4)
-        for row in assets_data[1:]:  # Skip header
+        for row in islice(assets_data, 1, None):  # Skip header
             if len(row) > 4 and str(row[4]).strip().upper() == vin.upper():
                 driver_name = str(row[3]).strip() if len(
                     row) > 3 else ""  # Column D = index 3
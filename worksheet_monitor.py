@@ -9,6 +9,7 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
+from itertools import islice
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -64,14 +65,15 @@ class WorksheetMonitor:
             }
         }
 
-    async def check_all_worksheets(self) -> Dict[str, WorksheetStatus]:
-        """Check status of all worksheets"""
-        statuses = {}
+    async def check_all_worksheets(
+            self, max_concurrency: int = 8) -> Dict[str, WorksheetStatus]:
+        """Check status of all worksheets concurrently (bounded by max_concurrency)"""
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        for worksheet_name, spec in self.worksheet_specs.items():
+        async def _check_one(worksheet_name: str, spec: Dict[str, Any]) -> WorksheetStatus:
             try:
-                status = await self._check_worksheet(worksheet_name, spec)
-                statuses[worksheet_name] = status
+                async with semaphore:
+                    status = await self._check_worksheet(worksheet_name, spec)
 
                 if not status.is_healthy and spec.get('critical', False):
                     logger.error(
@@ -79,10 +81,11 @@ class WorksheetMonitor:
                 elif not status.is_healthy:
                     logger.warning(
                         f"WARNING: {worksheet_name} worksheet is unhealthy - {status.error_message}")
+                return status
 
             except Exception as e:
                 logger.error(f"Error checking {worksheet_name}: {e}")
-                statuses[worksheet_name] = WorksheetStatus(
+                return WorksheetStatus(
                     name=worksheet_name,
                     last_update=None,
                     expected_interval_seconds=spec['expected_interval'],
@@ -92,6 +95,12 @@ class WorksheetMonitor:
                     update_method=spec['update_method']
                 )
 
+        names = list(self.worksheet_specs)
+        results = await asyncio.gather(
+            *(_check_one(name, self.worksheet_specs[name]) for name in names))
+        # gather preserves order, so the report keeps the spec ordering
+        statuses = dict(zip(names, results))
+
         self.last_check = datetime.now(pytz.timezone('America/New_York'))
         return statuses
 
@@ -116,7 +125,7 @@ class WorksheetMonitor:
 
         try:
             # Get basic worksheet info
-            all_values = worksheet.get_all_values()
+            all_values = await asyncio.to_thread(worksheet.get_all_values)
             row_count = len(all_values) - 1  # Exclude header
 
             # Try to determine last update time
@@ -183,7 +192,7 @@ class WorksheetMonitor:
                         time_cols.append(i)
 
                 latest_time = None
-                for row in all_values[1:]:
+                for row in islice(all_values, 1, None):
                     for col_idx in time_cols:
                         if col_idx < len(row) and row[col_idx]:
                             try:
@@ -235,7 +244,7 @@ class WorksheetMonitor:
                     col_idx = headers.index('updated_at')
                     latest_time = None
 
-                    for row in all_values[1:]:
+                    for row in islice(all_values, 1, None):
                         if col_idx < len(row) and row[col_idx]:
                             try:
                                 time_str = row[col_idx].strip()